@@ -1,19 +1,42 @@
 import asyncio
 import base64
+import hashlib
 import io
 import logging
+import orjson
 import os
+import pytz
+import re
+import sys
 import threading
 import time
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, Future
+from datetime import date as dt_date
 from datetime import datetime
 from datetime import timezone
 from datetime import timezone as dt_timezone
 from fastapi import APIRouter, Body, HTTPException, Query, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response, StreamingResponse
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
 from PIL import Image
-from redis import Redis
+from redis import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
 from rq import Queue
-from typing import Any, Dict, List, Optional, Union
+from rq.job import JobStatus
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from app.api.scan_predicates import (
+    AUDITED_MENU_KEYS,
+    AUDITED_PAN_KEYS,
+    is_bad_scan,
+    is_deleted_scan,
+)
+from app.audit_service import AuditSessionConflict
+from app.dynamo_service import invalidate_scans_cache
 
 # Import our models
 from app.models import (
@@ -26,6 +49,8 @@ from app.models import (
 )
 from app.scheduler import _compute_coverage_for_date as compute_coverage_for_date
 from app.scheduler import (
+    add_run_finished_listener,
+    add_state_listener,
     force_immediate_catch_up,
     get_ai_state,
     get_propagation_state,
@@ -39,13 +64,89 @@ from app.scheduler import (
 )
 from app.utils.config import load_config
 from app.utils.dynamo_client import test_connection
+from app.utils.json_response import FastJSONResponse
+from app.utils.json_response import dumps as json_dumps
+from app.utils.redis_client import get_redis_pool
+from app.utils.ttl_cache import TTLCache
 
-router = APIRouter()
+router = APIRouter(default_response_class=FastJSONResponse)
 logger = logging.getLogger(__name__)
 
-_presign_cache: Dict[str, Any] = {
-    "map": {},  # key -> {"url": str, "exp": float}
-}
+# Make repo root and audit_automation importable for background population
+# (done once at import rather than on every background run)
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+_REPO_ROOT = _BACKEND_DIR.parent
+_AUDIT_DIR = _REPO_ROOT / "audit_automation"
+for _path in (str(_REPO_ROOT), str(_AUDIT_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_PT_TZ = pytz.timezone("America/Los_Angeles")
+
+
+@lru_cache(maxsize=1024)
+def _validate_date(value: str) -> dt_date:
+    """Parse a strict YYYY-MM-DD date; raises ValueError for anything else."""
+    if not _DATE_RE.match(value):
+        raise ValueError(f"Invalid date: {value!r}")
+    return dt_date.fromisoformat(value)
+
+
+# Presigned URLs keyed by (key, width, fmt, quality); shared by /image/presign
+# and /pans so both endpoints reuse the same signatures
+_PRESIGN_TTL_SECONDS = 25 * 60  # presigned URLs are valid for an hour
+_PRESIGN_MIN_REMAINING_SECONDS = 60.0
+_presign_cache: TTLCache[str] = TTLCache(maxsize=20000, ttl=_PRESIGN_TTL_SECONDS)
+# Redis holds the same URLs for the other workers; after an error it is
+# skipped for a while instead of slowing every presign down
+_PRESIGN_REDIS_BACKOFF_SECONDS = 30.0
+_presign_redis_retry_at = 0.0
+
+_ZERO_SCAN_COUNTS = {"scanCount": 0, "normalScanCount": 0, "flaggedScanCount": 0}
+
+# Fixed /pans bodies returned on every poll while a day is still empty
+_PANS_EMPTY_BODY = json_dumps({"pans": []})
+_PANS_BUILDING_BODY = json_dumps({"pans": [], "building": True})
+
+# Background AI coverage refresh bookkeeping
+_COVERAGE_TTL_SECONDS = 30.0
+_coverage_refreshing: Set[str] = set()
+_coverage_lock = threading.Lock()
+
+# Server-sent event subscribers per date: (subscriber loop, queue) pairs
+_event_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_event_lock = threading.Lock()
+_SSE_KEEPALIVE_SECONDS = 15.0
+
+# Short-lived per-date cache of /restaurants/with-scans counts
+_rwc_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_rwc_lock = threading.Lock()
+_RWC_TTL_SECONDS = 5.0
+
+# Per (restaurant, date) menu item index for /menu_items: (lowered name, item)
+# pairs pre-sorted by frequency desc then name
+_menu_index_cache: TTLCache[List[Tuple[str, Dict[str, Any]]]] = TTLCache(
+    maxsize=256, ttl=5 * 60
+)
+_menu_index_generation: Dict[str, int] = {}
+
+# In-flight populate_audits_for_date runs started from the API, by date
+_population_futures: Dict[str, "Future[Any]"] = {}
+_population_lock = threading.Lock()
+
+# RQ queue for AI jobs, bound to the app's shared Redis connection pool
+_redis_lock = threading.Lock()
+_pan_ai_queue: Optional[Queue] = None
+_pan_ai_queue_pool: Optional[ConnectionPool] = None
+_PENDING_JOB_STATUSES = frozenset(
+    {JobStatus.QUEUED, JobStatus.STARTED, JobStatus.DEFERRED, JobStatus.SCHEDULED}
+)
+_job_loop: Optional[asyncio.AbstractEventLoop] = None
+# RQ jobs run in the worker process, so their set_ai_state never reaches this
+# process's listeners; the worker announces finished runs on this channel
+_AI_RUN_FINISHED_CHANNEL = "pan_ai:run_finished"
+_AI_RUN_SUBSCRIBER_RETRY_SECONDS = 5.0
 
 
 @router.get("/db/ping")
@@ -81,36 +182,191 @@ def db_ping(request: Request) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"DB ping failed: {str(e)}")
 
 
-def _enqueue_ai_job(date: str) -> bool:
+def _run_on_bg_loop(app: Any, coro: Any) -> Any:
+    """Run a coroutine on the app's background event loop and wait for it.
+
+    Falls back to a throwaway loop when the background loop is unavailable.
+    """
+    loop = getattr(app.state, "bg_loop", None)
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return asyncio.run(coro)
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _start_population(app: Any, date: str, smart_retry: bool = True) -> bool:
+    """Download and populate ``date`` (no AI) on the app's background loop.
+
+    At most one population per date is in flight; returns False if one
+    already is. With ``smart_retry`` a successful run kicks the smart retry.
+    """
+    with _population_lock:
+        in_flight = _population_futures.get(date)
+        if in_flight is not None and not in_flight.done():
+            return False
+        loop = getattr(app.state, "bg_loop", None)
+        coro = populate_audits_for_date(date, run_ai=False)
+        if loop is None or loop.is_closed() or not loop.is_running():
+            future = app.state.bg_executor.submit(asyncio.run, coro)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coro, loop)
+        _population_futures[date] = future
+
+    def _on_done(done: "Future[Any]") -> None:
+        with _population_lock:
+            if _population_futures.get(date) is done:
+                del _population_futures[date]
+        error = None if done.cancelled() else done.exception()
+        if error is not None:
+            logger.warning(f"Population failed for {date}: {error}")
+            return
+        if smart_retry:
+            # Smart retry is slow and synchronous; keep it off the loop
+            try:
+                app.state.bg_executor.submit(trigger_smart_retry_background)
+            except RuntimeError as e:
+                logger.warning(f"Smart retry not scheduled for {date}: {e}")
+
+    future.add_done_callback(_on_done)
+    return True
+
+
+def _get_pan_ai_queue(pool: ConnectionPool) -> Queue:
+    global _pan_ai_queue, _pan_ai_queue_pool
+    with _redis_lock:
+        if _pan_ai_queue is None or _pan_ai_queue_pool is not pool:
+            _pan_ai_queue = Queue("pan_ai", connection=Redis(connection_pool=pool))
+            _pan_ai_queue_pool = pool
+        return _pan_ai_queue
+
+
+def _invalidate_day_caches(date: str) -> None:
+    """Drop cached per-date views after scans for ``date`` were (re)written."""
+    invalidate_scans_cache(date)
+    with _rwc_lock:
+        _rwc_cache.pop(date, None)
+        # Menu indexes are keyed by generation; bumping it orphans the old
+        # entries, which then age out of the TTL cache on their own
+        _menu_index_generation[date] = _menu_index_generation.get(date, 0) + 1
+
+
+def _get_job_loop() -> asyncio.AbstractEventLoop:
+    # One event loop per worker process, reused across jobs
+    global _job_loop
+    if _job_loop is None or _job_loop.is_closed():
+        _job_loop = asyncio.new_event_loop()
+    return _job_loop
+
+
+def _run_pan_ai_job(date_str: str) -> None:
+    """RQ job: run propagation + pan AI for a date and record the outcome."""
+    try:
+        set_ai_state(date_str, running=True, lastError="")
+        _get_job_loop().run_until_complete(
+            populate_audits_for_date(date_str, run_ai=True)
+        )
+        set_ai_state(
+            date_str,
+            running=False,
+            completedAt=datetime.now(timezone.utc).isoformat(),
+            coverage=compute_coverage_for_date(date_str),
+        )
+    except Exception as e:
+        set_ai_state(date_str, running=False, lastError=str(e))
+    _publish_ai_run_finished(date_str)
+
+
+def _publish_ai_run_finished(date_str: str) -> None:
+    state = get_ai_state(date_str)
+    message = orjson.dumps(
+        {
+            "date": date_str,
+            "completedAt": state.get("completedAt"),
+            "lastError": state.get("lastError"),
+        }
+    )
     try:
-        cfg = load_config()
-        rconf = cfg.get("redis", {})
-        redis_conn = Redis(
-            host=rconf.get("host", "127.0.0.1"),
-            port=int(rconf.get("port", 6379)),
-            db=int(rconf.get("db", 0)),
+        Redis(connection_pool=get_redis_pool()).publish(
+            _AI_RUN_FINISHED_CHANNEL, message
         )
-        q = Queue("pan_ai", connection=redis_conn)
+    except Exception as e:
+        logger.warning(f"Could not announce finished AI run for {date_str}: {e}")
+
+
+def _on_ai_run_finished(message: bytes) -> None:
+    data = orjson.loads(message)
+    date_str = data["date"]
+    was_running = get_ai_state(date_str).get("running")
+    # Mirror the worker's final state for this process's pollers / SSE clients
+    set_ai_state(
+        date_str,
+        running=False,
+        completedAt=data.get("completedAt"),
+        lastError=data.get("lastError"),
+    )
+    if not was_running:
+        # No running -> stopped transition here, so no run-finished listeners
+        _invalidate_day_caches(date_str)
+
+
+def start_ai_run_subscriber(pool: ConnectionPool) -> threading.Event:
+    """
+    Apply AI runs finished by RQ workers to this process, in a daemon thread
 
-        def _job(date_str: str) -> None:
-            import asyncio as _asyncio
-            from datetime import datetime as _dt
-            from datetime import timezone as _tz
+    Args:
+        pool: Redis connection pool to subscribe with
 
-            from app.scheduler import populate_audits_for_date as _populate
-            from app.scheduler import set_ai_state as _set_state
+    Returns:
+        Event that stops the subscriber once set
+    """
+    stop = threading.Event()
 
+    def _listen() -> None:
+        while not stop.is_set():
+            pubsub = None
             try:
-                _set_state(date_str, running=True, lastError="")
-                _asyncio.run(_populate(date_str, run_ai=True))
-                _set_state(
-                    date_str, running=False, completedAt=_dt.now(_tz.utc).isoformat()
+                pubsub = Redis(connection_pool=pool).pubsub(
+                    ignore_subscribe_messages=True
                 )
-            except Exception as _e:
-                _set_state(date_str, running=False, lastError=str(_e))
-
-        # Enqueue callable with args
-        q.enqueue(_job, date)
+                pubsub.subscribe(_AI_RUN_FINISHED_CHANNEL)
+                while not stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    try:
+                        _on_ai_run_finished(message["data"])
+                    except Exception as e:
+                        logger.warning(f"Ignoring AI run notice {message}: {e}")
+            except Exception as e:
+                # Runs finished while disconnected are missed; the day caches
+                # still expire on their own TTLs
+                logger.warning(f"AI run subscriber lost Redis, retrying: {e}")
+                stop.wait(_AI_RUN_SUBSCRIBER_RETRY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+
+    threading.Thread(target=_listen, name="metron-ai-runs", daemon=True).start()
+    return stop
+
+
+def _enqueue_pan_ai_job(q: Queue, date: str) -> None:
+    # One job per date: skip if a run for this date is already pending
+    job_id = f"pan_ai:{date}"
+    existing = q.fetch_job(job_id)
+    if existing is not None and existing.get_status() in _PENDING_JOB_STATUSES:
+        logger.info(f"Pan AI job for {date} already {existing.get_status()}")
+        return
+    q.enqueue(_run_pan_ai_job, date, job_id=job_id)
+
+
+def _enqueue_ai_job(pool: ConnectionPool, date: str) -> bool:
+    try:
+        # Stale pooled connections get dropped and the enqueue retried once
+        try:
+            _enqueue_pan_ai_job(_get_pan_ai_queue(pool), date)
+        except RedisConnectionError:
+            pool.disconnect()
+            _enqueue_pan_ai_job(_get_pan_ai_queue(pool), date)
         return True
     except Exception as e:
         try:
@@ -139,8 +395,8 @@ async def run_pan_ai_now(
                 date = None
         # Validate date
         try:
-            _ = datetime.strptime(date or "", "%Y-%m-%d")
-        except Exception:
+            _validate_date(date or "")
+        except (TypeError, ValueError):
             raise HTTPException(
                 status_code=400, detail="Missing or invalid date. Use YYYY-MM-DD."
             )
@@ -148,17 +404,27 @@ async def run_pan_ai_now(
         # Mark AI running and dispatch job (RQ if available, else thread)
         if date is None:
             raise HTTPException(status_code=400, detail="Date is required")
+        _invalidate_day_caches(date)
         set_ai_state(date, running=True, lastError="")
-        if not _enqueue_ai_job(date):
+        # Redis I/O (with a reconnect retry) stays off the event loop
+        enqueued = await asyncio.to_thread(
+            _enqueue_ai_job, request.app.state.redis_pool, date
+        )
+        if not enqueued:
+            app = request.app
+            bg_executor = app.state.bg_executor
 
             def _run_ai() -> None:
                 try:
                     if date is not None:
-                        asyncio.run(populate_audits_for_date(date, run_ai=True))
+                        _run_on_bg_loop(
+                            app, populate_audits_for_date(date, run_ai=True)
+                        )
                     set_ai_state(
                         date,
                         running=False,
                         completedAt=datetime.now(timezone.utc).isoformat(),
+                        coverage=compute_coverage_for_date(date),
                     )
                 except Exception as e:
                     try:
@@ -169,13 +435,11 @@ async def run_pan_ai_now(
                 finally:
                     # Never block on smart retry; trigger it separately
                     try:
-                        threading.Thread(
-                            target=trigger_smart_retry_background, daemon=True
-                        ).start()
+                        bg_executor.submit(trigger_smart_retry_background)
                     except Exception:
                         pass
 
-            threading.Thread(target=_run_ai, daemon=True).start()
+            bg_executor.submit(_run_ai)
         return {
             "success": True,
             "message": "Pan AI enrichment started. This may take some time. You can keep auditing while it runs.",
@@ -207,8 +471,8 @@ async def force_redownload(
                 date = None
         # Validate date
         try:
-            _ = datetime.strptime(date or "", "%Y-%m-%d")
-        except Exception:
+            _validate_date(date or "")
+        except (TypeError, ValueError):
             raise HTTPException(
                 status_code=400, detail="Missing or invalid date. Use YYYY-MM-DD."
             )
@@ -218,31 +482,12 @@ async def force_redownload(
             set_propagation_state(date, running=True)
         except Exception:
             pass
+        _invalidate_day_caches(date)
 
-        def _run_targeted() -> None:
-            try:
-                # Ensure repo/audit on path lazily
-                import sys as _sys
-                from pathlib import Path as _Path
-
-                backend_dir = _Path(__file__).resolve().parents[2]
-                repo_root = backend_dir.parent
-                audit_dir = repo_root / "audit_automation"
-                if str(repo_root) not in _sys.path:
-                    _sys.path.insert(0, str(repo_root))
-                if str(audit_dir) not in _sys.path:
-                    _sys.path.insert(0, str(audit_dir))
-
-                # Download and populate for the requested date (NO AI; do not trigger smart retry)
-                if date is not None:
-                    asyncio.run(populate_audits_for_date(date, run_ai=False))
-            except Exception as _e:
-                try:
-                    logger.warning(f"Force redownload failed for {date}: {_e}")
-                except Exception:
-                    pass
-
-        threading.Thread(target=_run_targeted, daemon=True).start()
+        # Download and populate for the requested date (NO AI; do not trigger
+        # smart retry); a run already in flight for the date is reused
+        if date is not None:
+            _start_population(request.app, date, smart_retry=False)
         return {
             "success": True,
             "message": f"Started re-download and population (no AI) for {date}. This may take a few minutes.",
@@ -254,24 +499,139 @@ async def force_redownload(
         raise HTTPException(status_code=500, detail="Failed to start re-download")
 
 
+def _state_snapshot(date: str) -> Dict[str, Any]:
+    state = get_propagation_state(date)
+    ai = get_ai_state(date)
+    return {
+        "date": date,
+        "propagating": state.get("running", False),
+        "noData": state.get("noData", False),
+        "aiRunning": ai.get("running", False),
+        "aiCompletedAt": ai.get("completedAt"),
+        "aiLastError": ai.get("lastError"),
+        "aiCoverage": ai.get("coverage"),
+    }
+
+
+def _publish_state(date: str) -> None:
+    # Called from whichever thread changed the state; hand off to each
+    # subscriber's event loop
+    with _event_lock:
+        subscribers = list(_event_subscribers.get(date, ()))
+    if not subscribers:
+        return
+    snapshot = _state_snapshot(date)
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+        except RuntimeError:
+            # Subscriber loop already closed
+            pass
+
+
+add_state_listener(_publish_state)
+# Propagation / AI runs rewrite the day's scans; only a finished run
+# invalidates, so coverage refreshes and polling updates keep the caches
+add_run_finished_listener(_invalidate_day_caches)
+
+
+def _sse_message(payload: Dict[str, Any]) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+@router.get("/events/{date}")
+async def stream_state_events(request: Request, date: str) -> StreamingResponse:
+    """Server-sent events stream of propagation/AI state for a date.
+
+    Sends the current state on connect, then one event per state change, so
+    clients can subscribe once instead of polling the status endpoints.
+    """
+    try:
+        _validate_date(date)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
+        )
+
+    queue: asyncio.Queue = asyncio.Queue()
+    subscriber = (asyncio.get_running_loop(), queue)
+    with _event_lock:
+        _event_subscribers.setdefault(date, set()).add(subscriber)
+
+    async def _events() -> Any:
+        try:
+            yield _sse_message(_state_snapshot(date))
+            while True:
+                try:
+                    snapshot = await asyncio.wait_for(
+                        queue.get(), timeout=_SSE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keepalive\n\n"
+                    continue
+                yield _sse_message(snapshot)
+        finally:
+            with _event_lock:
+                subscribers = _event_subscribers.get(date)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        _event_subscribers.pop(date, None)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/status")
 def read_status() -> Any:
     config = load_config()
     return test_connection(config["dynamodb"]["table_names"]["audit_session"])
 
 
+def _refresh_coverage(date: str) -> None:
+    try:
+        set_ai_state(date, coverage=compute_coverage_for_date(date))
+    finally:
+        with _coverage_lock:
+            _coverage_refreshing.discard(date)
+
+
+def _schedule_coverage_refresh(app: Any, date: str) -> None:
+    """Recompute AI coverage in the background if the cached value is stale.
+
+    Status endpoints serve whatever coverage is cached; the table scan behind
+    it runs at most once per ``_COVERAGE_TTL_SECONDS`` per date.
+    """
+    ai = get_ai_state(date)
+    if ai.get("running", False):
+        return
+    if time.time() - float(ai.get("coverageAt") or 0) < _COVERAGE_TTL_SECONDS:
+        return
+    with _coverage_lock:
+        if date in _coverage_refreshing:
+            return
+        _coverage_refreshing.add(date)
+    try:
+        app.state.bg_executor.submit(_refresh_coverage, date)
+    except Exception as e:
+        with _coverage_lock:
+            _coverage_refreshing.discard(date)
+        logger.warning(f"Failed to schedule coverage refresh for {date}: {e}")
+
+
 @router.get("/pan_ai/status")
-def get_pan_ai_status(date: str) -> Dict[str, Any]:
+def get_pan_ai_status(request: Request, date: str) -> Dict[str, Any]:
     """Return AI workflow status for a given date."""
     if not date:
         raise HTTPException(status_code=400, detail="date is required")
     try:
         ai = get_ai_state(date)
-        if not ai.get("running", False):
-            try:
-                ai["coverage"] = compute_coverage_for_date(date)
-            except Exception:
-                pass
+        _schedule_coverage_refresh(request.app, date)
         return {
             "running": bool(ai.get("running", False)),
             "completedAt": ai.get("completedAt"),
@@ -284,15 +644,83 @@ def get_pan_ai_status(date: str) -> Dict[str, Any]:
 
 
 @router.get("/restaurants")
-def get_restaurants_routes(request: Request) -> Any:
+async def get_restaurants_routes(request: Request) -> Any:
     skoopin_service = request.app.state.skoopin_service
-    restaurants = skoopin_service.get_restaurants()
+    restaurants = await asyncio.to_thread(skoopin_service.get_restaurants)
+
+    return FastJSONResponse(content={"restaurants": restaurants})
+
+
+async def _count_restaurant_scans(
+    skoopin_service: Any, dynamo_service: Any, date: str
+) -> List[Dict[str, Any]]:
+    """Return restaurants with scans on ``date`` along with their scan counts."""
+    all_restaurants = await asyncio.to_thread(skoopin_service.get_restaurants)
+
+    # Read the whole day once from the date GSI and bucket it by restaurant;
+    # without that index, run concurrent per-restaurant partition queries
+    candidates = [r for r in all_restaurants if r.get("id")]
+    day_scans = await asyncio.to_thread(dynamo_service.get_scans_by_day, date)
+    if day_scans is not None:
+        buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for scan in day_scans:
+            rid = str(scan.get("RestaurantDate") or "").split("#", 1)[0]
+            buckets[rid].append(scan)
+        scans_lists = [buckets.get(str(r.get("id")), []) for r in candidates]
+    else:
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    dynamo_service.get_scans_by_restaurant_day, r.get("id"), date
+                )
+                for r in candidates
+            ),
+            return_exceptions=True,
+        )
+        # A restaurant whose query failed is reported as having no scans
+        scans_lists = [[] if isinstance(r, BaseException) else r for r in results]
+
+    # Get scan counts for each restaurant on the specified date
+    counted = []
+    for restaurant, scans in zip(candidates, scans_lists):
+        # Count normal vs flagged scans
+        flagged_count = 0
+        for scan in scans:
+            # Same rules as get_scans_to_audit use to decide if a scan is bad
+            flagged_count += is_bad_scan(scan)
+        normal_count = len(scans) - flagged_count
+
+        total_count = normal_count + flagged_count
+
+        # Only include restaurants that have scans
+        if total_count > 0:
+            counted.append((restaurant, total_count, normal_count, flagged_count))
+
+    # One scan for the day's in-progress sessions, looked up per restaurant
+    sessions_by_restaurant: Dict[str, List[Dict[str, Any]]] = {}
+    if counted:
+        sessions_by_restaurant = (
+            await asyncio.to_thread(dynamo_service.get_active_sessions_by_date, date)
+            or {}
+        )
 
-    return JSONResponse(content={"restaurants": restaurants})
+    restaurants_with_counts = []
+    for restaurant, total_count, normal_count, flagged_count in counted:
+        active_count = len(sessions_by_restaurant.get(str(restaurant.get("id")), ()))
+        r = dict(restaurant)
+        r["scanCount"] = total_count
+        r["normalScanCount"] = normal_count
+        r["flaggedScanCount"] = flagged_count
+        r["activeAuditors"] = active_count
+        restaurants_with_counts.append(r)
+
+    return restaurants_with_counts
 
 
 @router.get("/restaurants/with-scans")
-def get_restaurants_with_scans(request: Request, date: Optional[str] = None) -> Any:
+async def get_restaurants_with_scans(
+    request: Request, date: Optional[str] = None
+) -> Any:
     """
     Get restaurants that have scans on a specific date, with scan counts.
     If no date is provided, returns all restaurants with 0 scan counts.
@@ -300,7 +728,7 @@ def get_restaurants_with_scans(request: Request, date: Optional[str] = None) ->
     if date:
         # Prevent future-dated queries
         try:
-            requested = datetime.strptime(date, "%Y-%m-%d").date()
+            requested = _validate_date(date)
         except ValueError:
             raise HTTPException(
                 status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
@@ -314,157 +742,33 @@ def get_restaurants_with_scans(request: Request, date: Optional[str] = None) ->
     skoopin_service = request.app.state.skoopin_service
     dynamo_service = request.app.state.dynamo_service
 
-    # Get all restaurants
-    all_restaurants = skoopin_service.get_restaurants()
-
     if not date:
         # If no date provided, return all restaurants with 0 scan counts
-        restaurants_with_counts = []
-        for restaurant in all_restaurants:
-            restaurants_with_counts.append(
-                {
-                    **restaurant,
-                    "scanCount": 0,
-                    "normalScanCount": 0,
-                    "flaggedScanCount": 0,
-                }
-            )
-        return JSONResponse(content={"restaurants": restaurants_with_counts})
-
-    # Get scan counts for each restaurant on the specified date
-    restaurants_with_counts = []
-    for restaurant in all_restaurants:
-        restaurant_id = restaurant.get("id")
-        if restaurant_id:
-            # Get scans for this restaurant on the specified date
-            scans = dynamo_service.get_scans_by_restaurant_day(restaurant_id, date)
-
-            # Count normal vs flagged scans
-            normal_count = 0
-            flagged_count = 0
-
-            for scan in scans:
-                # Use the same logic as in get_scans_to_audit to determine if scan is bad
-                def _to_float(value: Any, default: float = 0.0) -> float:
-                    try:
-                        return float(value)
-                    except Exception:
-                        return default
-
-                def _to_bool(value: Any) -> bool:
-                    if isinstance(value, bool):
-                        return value
-                    if isinstance(value, (int, float)):
-                        return value != 0
-                    if isinstance(value, str):
-                        return value.strip().lower() in {"true", "1", "yes", "y"}
-                    return False
-
-                def _has_pan_id(scan: dict) -> bool:
-                    pan_id = (
-                        scan.get("panId") or scan.get("PanID") or scan.get("pan_id")
-                    )
-                    if isinstance(pan_id, str) and pan_id.strip().lower() in {
-                        "unrecognized",
-                        "unknown",
-                        "none",
-                        "",
-                    }:
-                        pan_id = None
-                    return pan_id is not None
-
-                def _has_menu_id(scan: dict) -> bool:
-                    menu_id = (
-                        scan.get("menuItemId")
-                        or scan.get("MenuItemID")
-                        or scan.get("reportedMenuItemId")
-                    )
-                    return menu_id is not None
-
-                def _is_empty_scan(scan: dict) -> bool:
-                    if (
-                        _to_bool(scan.get("isEmpty"))
-                        or _to_bool(scan.get("empty"))
-                        or _to_bool(scan.get("emptyScan"))
-                        or _to_bool(scan.get("IsEmptyScan"))
-                    ):
-                        return True
-                    reason = (
-                        (
-                            scan.get("panAuditReason")
-                            or scan.get("reason")
-                            or scan.get("tags")
-                            or ""
-                        )
-                        .__str__()
-                        .lower()
-                    )
-                    return "empty" in reason
-
-                def _is_non_food(scan: dict) -> bool:
-                    if (
-                        _to_bool(scan.get("nonFood"))
-                        or _to_bool(scan.get("isNonFood"))
-                        or _to_bool(scan.get("non_food"))
-                    ):
-                        return True
-                    label = (
-                        (
-                            scan.get("classification")
-                            or scan.get("label")
-                            or scan.get("panAuditReason")
-                            or ""
-                        )
-                        .__str__()
-                        .lower()
-                    )
-                    return (
-                        ("non food" in label)
-                        or ("non-food" in label)
-                        or ("nonfood" in label)
-                    )
-
-                def _is_bad_scan(scan: dict) -> bool:
-                    # Rule 1: < 8oz and no panId and no menuItemId
-                    weight_under = _to_float(scan.get("weight"), 0.0) < 8.0
-                    no_ids = (not _has_pan_id(scan)) and (not _has_menu_id(scan))
-                    if weight_under and no_ids:
-                        return True
-                    # Rule 2: empty scans
-                    if _is_empty_scan(scan):
-                        return True
-                    # Rule 3: non-food on scale
-                    if _is_non_food(scan):
-                        return True
-                    return False
-
-                if _is_bad_scan(scan):
-                    flagged_count += 1
-                else:
-                    normal_count += 1
-
-            total_count = normal_count + flagged_count
-
-            # Only include restaurants that have scans
-            if total_count > 0:
-                # Count active sessions for this restaurant/date
-                try:
-                    active_sessions = (
-                        dynamo_service.get_active_sessions_for_date(restaurant_id, date)
-                        or []
-                    )
-                    active_count = len(active_sessions)
-                except Exception:
-                    active_count = 0
-                restaurants_with_counts.append(
-                    {
-                        **restaurant,
-                        "scanCount": total_count,
-                        "normalScanCount": normal_count,
-                        "flaggedScanCount": flagged_count,
-                        "activeAuditors": active_count,
-                    }
-                )
+        all_restaurants = await asyncio.to_thread(skoopin_service.get_restaurants)
+        restaurants_with_counts = [
+            dict(restaurant, **_ZERO_SCAN_COUNTS) for restaurant in all_restaurants
+        ]
+        return FastJSONResponse(content={"restaurants": restaurants_with_counts})
+
+    # The UI polls this while propagation/AI runs; reuse a very recent result
+    now = time.monotonic()
+    with _rwc_lock:
+        entry = _rwc_cache.get(date)
+    if entry and now - entry[0] < _RWC_TTL_SECONDS:
+        restaurants_with_counts = entry[1]
+    else:
+        restaurants_with_counts = await _count_restaurant_scans(
+            skoopin_service, dynamo_service, date
+        )
+        if restaurants_with_counts:
+            with _rwc_lock:
+                for stale in [
+                    d
+                    for d, (ts, _) in _rwc_cache.items()
+                    if now - ts >= _RWC_TTL_SECONDS
+                ]:
+                    del _rwc_cache[stale]
+                _rwc_cache[date] = (now, restaurants_with_counts)
 
     # If no restaurants found for the date, trigger automatic download and propagation
     if not restaurants_with_counts and date:
@@ -477,56 +781,19 @@ def get_restaurants_with_scans(request: Request, date: Optional[str] = None) ->
                 except Exception:
                     pass
 
-                def _run_targeted() -> None:
-                    try:
-                        # Ensure repo/audit on path lazily
-                        import sys as _sys
-                        from pathlib import Path as _Path
-
-                        backend_dir = _Path(__file__).resolve().parents[2]
-                        repo_root = backend_dir.parent
-                        audit_dir = repo_root / "audit_automation"
-                        if str(repo_root) not in _sys.path:
-                            _sys.path.insert(0, str(repo_root))
-                        if str(audit_dir) not in _sys.path:
-                            _sys.path.insert(0, str(audit_dir))
-
-                        # Download and populate for the requested date (no AI on date-click flow)
-                        asyncio.run(populate_audits_for_date(date, run_ai=False))
-
-                        # Trigger smart retry in a separate background thread so Redis or queue issues never block propagation
-                        def _trigger_retry() -> None:
-                            try:
-                                trigger_smart_retry_background()
-                            except Exception as _re:
-                                try:
-                                    logger.warning(
-                                        f"Smart retry trigger failed after propagation for {date}: {_re}"
-                                    )
-                                except Exception:
-                                    pass
-
-                        threading.Thread(target=_trigger_retry, daemon=True).start()
-                    except Exception as _e:
-                        try:
-                            logger.warning(f"Auto download failed for {date}: {_e}")
-                        except Exception:
-                            pass
-
-                threading.Thread(target=_run_targeted, daemon=True).start()
+                # Download and populate for the requested date (no AI on
+                # date-click flow), then kick the smart retry
+                _start_population(request.app, date)
         except Exception:
             pass
 
     # Attach propagation state so UI can stop polling when true no-data
     state = get_propagation_state(date)
     ai = get_ai_state(date) if date else {"running": False, "completedAt": None}
-    if date and not ai.get("running", False):
-        # Refresh coverage snapshot when not in running state
-        try:
-            ai["coverage"] = compute_coverage_for_date(date)
-        except Exception:
-            pass
-    return JSONResponse(
+    if date:
+        # Refresh coverage snapshot in the background when not running
+        _schedule_coverage_refresh(request.app, date)
+    return FastJSONResponse(
         content={
             "restaurants": restaurants_with_counts,
             "propagating": state.get("running", False),
@@ -537,8 +804,142 @@ def get_restaurants_with_scans(request: Request, date: Optional[str] = None) ->
     )
 
 
+def _presign_redis() -> Optional[Redis]:
+    """Redis client for the shared presign cache, or None while backing off."""
+    if time.monotonic() < _presign_redis_retry_at:
+        return None
+    return Redis(connection_pool=get_redis_pool())
+
+
+def _presign_redis_failed(e: Exception) -> None:
+    global _presign_redis_retry_at
+    _presign_redis_retry_at = time.monotonic() + _PRESIGN_REDIS_BACKOFF_SECONDS
+    logger.warning(f"Presign cache Redis unavailable, using local cache only: {e}")
+
+
+def _cached_presign(
+    aws_service: Any, key: str, width: int, fmt: str, quality: int
+) -> Optional[str]:
+    """Presign an image rendition, reusing a cached URL while it is still fresh.
+
+    Looks in the in-process cache, then the Redis cache shared by all workers,
+    and only signs on a miss in both.
+    """
+    cache_key = (key, width, fmt, quality)
+    cached = _presign_cache.get(cache_key, min_ttl=_PRESIGN_MIN_REMAINING_SECONDS)
+    if cached:
+        return cached
+
+    redis_key = f"presign:{width}:{fmt}:{quality}:{key}"
+    client = _presign_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            shared, ttl_ms = pipe.get(redis_key).pttl(redis_key).execute()
+        except RedisError as e:
+            _presign_redis_failed(e)
+            client = None
+        else:
+            remaining = ttl_ms / 1000.0
+            if shared and remaining > _PRESIGN_MIN_REMAINING_SECONDS:
+                url = shared.decode()
+                _presign_cache.set(cache_key, url, ttl=remaining)
+                return url
+
+    url = aws_service.get_optimized_presigned_url(
+        key, target_width=width, image_format=fmt, quality=quality
+    )
+    if url:
+        _presign_cache.set(cache_key, url)
+        if client is not None:
+            try:
+                client.set(redis_key, url, ex=_PRESIGN_TTL_SECONDS, nx=True)
+            except RedisError as e:
+                _presign_redis_failed(e)
+    return url
+
+
+def _build_pan_from_row(
+    spid: str, row: Optional[Dict[str, Any]], audited_pan_ids: Set[str]
+) -> Dict[str, Any]:
+    """Shape a reference pan DB row into the pan payload the UI expects."""
+    pan: Dict[str, Any] = {"ID": spid, "wasAudited": spid in audited_pan_ids}
+    if not isinstance(row, dict):
+        return pan
+    db_shape = row.get("Shape") if row.get("Shape") is not None else ""
+    pan.update(
+        {
+            # pass through commonly used fields with safe defaults
+            "Number": row.get("Number", ""),
+            "ShortID": row.get("ShortID", ""),
+            "DetectedSizeStandard": row.get("DetectedSizeStandard", ""),
+            "Weight": row.get("Weight", 0.0),
+            "DetectedDepth": row.get("DetectedDepth", 0.0),
+            "Depth": row.get("Depth", row.get("DetectedDepth", 0.0)),
+            "Volume": row.get("Volume", 0.0),
+            "Status": row.get("Status", ""),
+            # Do not include selection fields for EMPTY pans; UI should use
+            # dbShape/dbSizeStandard for filtering
+            "dbShape": db_shape,
+            "dbSizeStandard": row.get("SizeStandard", ""),
+            # Pass through pans Data blob with dimensions if present
+            "Data": row.get("Data") or {},
+            "CapturedAt": row.get("CapturedAt"),
+            "CreatedAt": row.get("CreatedAt"),
+            "UpdatedAt": row.get("UpdatedAt"),
+        }
+    )
+    img = row.get("ImageURL")
+    if isinstance(img, str) and img.startswith(("http://", "https://")):
+        pan["imageUrl"] = img
+    elif img:
+        pan["_imageKey"] = img
+    return pan
+
+
+async def _presign_pan_images(
+    executor: Executor, aws_service: Any, pans: List[Dict[str, Any]]
+) -> None:
+    """Swap each pan's ``_imageKey`` for a presigned ``imageUrl``.
+
+    Cached URLs are applied inline; only the misses (one per distinct key) are
+    signed, concurrently on the dedicated presign pool.
+    """
+    misses: Dict[str, List[Dict[str, Any]]] = {}
+    for pan in pans:
+        key = pan.get("_imageKey")
+        if not key:
+            continue
+        cached = _presign_cache.get(
+            (key, 1600, "WEBP", 70), min_ttl=_PRESIGN_MIN_REMAINING_SECONDS
+        )
+        if cached:
+            pan["imageUrl"] = cached
+            pan.pop("_imageKey", None)
+        else:
+            misses.setdefault(key, []).append(pan)
+    if not misses:
+        return
+
+    loop = asyncio.get_running_loop()
+    urls = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor, _cached_presign, aws_service, key, 1600, "WEBP", 70
+            )
+            for key in misses
+        ),
+        return_exceptions=True,
+    )
+    for waiting, url in zip(misses.values(), urls):
+        if isinstance(url, str) and url:
+            for pan in waiting:
+                pan["imageUrl"] = url
+                pan.pop("_imageKey", None)
+
+
 @router.get("/pans")
-def get_registered_pans(
+async def get_registered_pans(
     request: Request, restaurantId: Optional[int] = None, date: Optional[str] = None
 ) -> Any:
     """
@@ -550,17 +951,7 @@ def get_registered_pans(
     """
     dynamo_service = request.app.state.dynamo_service
     db_service = request.app.state.database_service
-
-    # Helper to ensure JSON-serializable values
-    def _safe_dt(v: Any) -> Any:
-        try:
-            from datetime import datetime as _dt
-
-            if isinstance(v, _dt):
-                return v.isoformat()
-        except Exception:
-            pass
-        return v
+    aws_service = request.app.state.aws_service
 
     pans: List[Dict[str, Any]] = []
     audited_pan_ids = set()
@@ -572,7 +963,10 @@ def get_registered_pans(
             pass
         if date:
             scans_for_day = (
-                dynamo_service.get_scans_by_restaurant_day(restaurantId, date) or []
+                await asyncio.to_thread(
+                    dynamo_service.get_scans_by_restaurant_day, restaurantId, date
+                )
+                or []
             )
             for s in scans_for_day:
                 is_audited = str(s.get("isAudited", "")).strip().lower() in {
@@ -599,8 +993,12 @@ def get_registered_pans(
 
         # Primary path: query DB for pans for the restaurant, prefer Type=6; if date provided, limit to that day +/- 0
         ref_rows = (
-            request.app.state.database_service.get_reference_pans_for_restaurant(
-                restaurantId, date=date, types=[6], days_back=0
+            await asyncio.to_thread(
+                db_service.get_reference_pans_for_restaurant,
+                restaurantId,
+                date=date,
+                types=[6],
+                days_back=0,
             )
             or []
         )
@@ -608,9 +1006,8 @@ def get_registered_pans(
             logger.info(f"/pans DB primary rows: {len(ref_rows)}")
         except Exception:
             pass
-        # Build set of unique pan IDs from DB rows
-        observed_ids = []
-        seen_ids = set()
+        # Build one pan per unique pan ID from DB rows (first row wins)
+        pans_by_id: Dict[str, Dict[str, Any]] = {}
         for row in ref_rows:
             # Exclude status 0 rows defensively
             try:
@@ -622,53 +1019,14 @@ def get_registered_pans(
             if pid is None:
                 continue
             spid = str(pid)
-            if spid in seen_ids:
+            if spid in pans_by_id:
                 continue
-            seen_ids.add(spid)
-            db_shape = row.get("Shape") if row.get("Shape") is not None else ""
-            db_size = row.get("SizeStandard", "")
-            pan = {
-                "ID": spid,
-                "wasAudited": spid in audited_pan_ids,
-                # pass through commonly used fields with safe defaults
-                "Number": row.get("Number", ""),
-                "ShortID": row.get("ShortID", ""),
-                "DetectedSizeStandard": row.get("DetectedSizeStandard", ""),
-                "Weight": row.get("Weight", 0.0),
-                "DetectedDepth": row.get("DetectedDepth", 0.0),
-                "Depth": row.get("Depth", row.get("DetectedDepth", 0.0)),
-                "Volume": row.get("Volume", 0.0),
-                "Status": row.get("Status", ""),
-                # Do not include selection fields for EMPTY pans
-                # Always include DB-provided values for filtering
-                "dbShape": db_shape,
-                "dbSizeStandard": db_size,
-                # Pass through pans Data blob with dimensions if present
-                "Data": row.get("Data") or {},
-                "CapturedAt": _safe_dt(row.get("CapturedAt")),
-                "CreatedAt": _safe_dt(row.get("CreatedAt")),
-                "UpdatedAt": _safe_dt(row.get("UpdatedAt")),
-            }
-            # No prefill for EMPTY pans; UI should use dbShape/dbSizeStandard for filtering
-            img = row.get("ImageURL")
-            if isinstance(img, str) and (
-                img.startswith("http://") or img.startswith("https://")
-            ):
-                pan["imageUrl"] = img
-            elif img:
-                pan["_imageKey"] = img
-                # Presign image so UI can render without extra roundtrip
-                try:
-                    url = request.app.state.aws_service.get_optimized_presigned_url(
-                        img, target_width=1600, image_format="WEBP", quality=70
-                    )
-                    if url:
-                        pan["imageUrl"] = url
-                        pan.pop("_imageKey", None)
-                except Exception:
-                    pass
-            observed_ids.append(pan)
-        pans = observed_ids
+            pans_by_id[spid] = _build_pan_from_row(spid, row, audited_pan_ids)
+        pans = list(pans_by_id.values())
+        # Presign images so UI can render without extra roundtrip
+        await _presign_pan_images(
+            request.app.state.presign_executor, aws_service, pans
+        )
 
         # Fallback: if DB rows are empty for some reason but we have a date, try batch query by observed pan IDs from scans
         if (not pans) and date and scans_for_day:
@@ -696,76 +1054,31 @@ def get_registered_pans(
                     logger.info(
                         f"/pans fallback: querying DB for {len(observed_from_scans)} observed pan IDs from scans"
                     )
-                    # Use the main method without date filtering to get all pans, then filter
+                    # No date filter, but only read rows for the observed pans
                     all_ref_rows = (
-                        request.app.state.database_service.get_reference_pans_for_restaurant(
-                            restaurantId, types=[6]
+                        await asyncio.to_thread(
+                            db_service.get_reference_pans_for_restaurant,
+                            restaurantId,
+                            types=[6],
+                            pan_ids=sorted(observed_from_scans),
                         )
                         or []
                     )
-                    fallback_list: List[Dict[str, Any]] = []
-                    for spid in observed_from_scans:
-                        fallback_pan: Dict[str, Any] = {
-                            "ID": spid,
-                            "wasAudited": spid in audited_pan_ids,
-                        }
-                        # Find matching pan in all_ref_rows
-                        ref = None
-                        for row in all_ref_rows:
-                            if str(row.get("PanID")) == spid:
-                                ref = row
-                                break
-                        # Enrich with details if available
-                        if isinstance(ref, dict):
-                            db_shape = (
-                                ref.get("Shape") if ref.get("Shape") is not None else ""
-                            )
-                            db_size = ref.get("SizeStandard", "")
-                            fallback_pan.update(
-                                {
-                                    "Number": ref.get("Number", ""),
-                                    "ShortID": ref.get("ShortID", ""),
-                                    "DetectedSizeStandard": ref.get(
-                                        "DetectedSizeStandard", ""
-                                    ),
-                                    "Weight": ref.get("Weight", 0.0),
-                                    "DetectedDepth": ref.get("DetectedDepth", 0.0),
-                                    "Depth": ref.get(
-                                        "Depth", ref.get("DetectedDepth", 0.0)
-                                    ),
-                                    "Volume": ref.get("Volume", 0.0),
-                                    "Status": ref.get("Status", ""),
-                                    # Do not include selection fields for EMPTY pans
-                                    "dbShape": db_shape,
-                                    "dbSizeStandard": db_size,
-                                    "Data": ref.get("Data") or {},
-                                    "CapturedAt": _safe_dt(ref.get("CapturedAt")),
-                                    "CreatedAt": _safe_dt(ref.get("CreatedAt")),
-                                    "UpdatedAt": _safe_dt(ref.get("UpdatedAt")),
-                                }
-                            )
-                            # No prefill for EMPTY pans; UI should use db* fields for filters
-                        img = ref.get("ImageURL") if isinstance(ref, dict) else None
-                        if isinstance(img, str) and (
-                            img.startswith("http://") or img.startswith("https://")
-                        ):
-                            fallback_pan["imageUrl"] = img
-                        elif img:
-                            fallback_pan["_imageKey"] = img
-                            # Presign image so UI can render without extra roundtrip
-                            try:
-                                url = request.app.state.aws_service.get_optimized_presigned_url(
-                                    img,
-                                    target_width=1600,
-                                    image_format="WEBP",
-                                    quality=70,
-                                )
-                                if url:
-                                    fallback_pan["imageUrl"] = url
-                                    fallback_pan.pop("_imageKey", None)
-                            except Exception:
-                                pass
-                        fallback_list.append(fallback_pan)
+                    # Index reference rows by pan ID once (first row wins)
+                    ref_by_id: Dict[str, Dict[str, Any]] = {}
+                    for row in all_ref_rows:
+                        if row.get("PanID") is not None:
+                            ref_by_id.setdefault(str(row.get("PanID")), row)
+                    fallback_list: List[Dict[str, Any]] = [
+                        _build_pan_from_row(spid, ref_by_id.get(spid), audited_pan_ids)
+                        for spid in observed_from_scans
+                    ]
+                    # Presign images so UI can render without extra roundtrip
+                    await _presign_pan_images(
+                        request.app.state.presign_executor,
+                        aws_service,
+                        fallback_list,
+                    )
                     pans = fallback_list
                     logger.info(f"/pans fallback: built {len(pans)} pans from DB query")
             except Exception as fe:
@@ -780,7 +1093,9 @@ def get_registered_pans(
                 state_now = get_propagation_state(date)
                 # If propagation is running, indicate building state
                 if state_now.get("running", False):
-                    return JSONResponse(content={"pans": [], "building": True})
+                    return Response(
+                        content=_PANS_BUILDING_BODY, media_type="application/json"
+                    )
             except Exception:
                 pass
     except Exception as e:
@@ -791,11 +1106,42 @@ def get_registered_pans(
         except Exception:
             pass
 
-    return JSONResponse(content={"pans": pans})
+    if not pans:
+        return Response(content=_PANS_EMPTY_BODY, media_type="application/json")
+    return FastJSONResponse(content={"pans": pans})
+
+
+def _menu_item_key(scan: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Return the (menu item id, name) a scan was reported as, if it has both."""
+    mid = (
+        scan.get("menuItemId")
+        or scan.get("MenuItemID")
+        or scan.get("reportedMenuItemId")
+    )
+    name = (
+        scan.get("reportedMenuItemName")
+        or scan.get("menuItemName")
+        or scan.get("MenuItemName")
+    )
+    if not mid or not name:
+        return None
+    return (str(mid), str(name))
+
+
+def _build_menu_index(
+    scans: Iterable[Dict[str, Any]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Count distinct menu items in ``scans``, most frequent first."""
+    counts = Counter(k for k in map(_menu_item_key, scans) if k)
+    ordered = sorted(counts.items(), key=lambda kc: (-kc[1], kc[0][1]))
+    return [
+        (name.lower(), {"id": mid, "name": name, "count": c})
+        for (mid, name), c in ordered
+    ]
 
 
 @router.get("/menu_items")
-def search_menu_items(
+async def search_menu_items(
     request: Request,
     restaurantId: int,
     date: Optional[str] = None,
@@ -807,75 +1153,69 @@ def search_menu_items(
     Returns distinct menu items seen in scans, filtered by query substring when provided.
     """
     try:
-        dynamo_service = request.app.state.dynamo_service
-        scans = dynamo_service.get_scans_by_restaurant_day(restaurantId, date) or []
-
-        # Build frequency map of (id, name)
-        counts: Dict[tuple, int] = {}
-        for s in scans:
-            mid = (
-                s.get("menuItemId")
-                or s.get("MenuItemID")
-                or s.get("reportedMenuItemId")
-                or None
-            )
-            name = (
-                s.get("reportedMenuItemName")
-                or s.get("menuItemName")
-                or s.get("MenuItemName")
-                or None
+        index_key = (restaurantId, date, _menu_index_generation.get(date or "", 0))
+        index = _menu_index_cache.get(index_key)
+        if index is None:
+            dynamo_service = request.app.state.dynamo_service
+            scans = (
+                await asyncio.to_thread(
+                    dynamo_service.get_scans_by_restaurant_day, restaurantId, date
+                )
+                or []
             )
-            if mid is None or name is None:
-                continue
-            key = (str(mid), str(name))
-            counts[key] = counts.get(key, 0) + 1
-
-        items = [{"id": k[0], "name": k[1], "count": c} for k, c in counts.items()]
+            index = _build_menu_index(scans)
+            _menu_index_cache.set(index_key, index)
 
-        # Filter by query substring if provided
-        if q:
-            ql = q.strip().lower()
-            if ql:
-                items = [it for it in items if ql in it["name"].lower()]
-
-        # Sort by frequency desc then name
-        items.sort(key=lambda x: (-x.get("count", 0), x.get("name", "")))
-        return {"items": items[: max(1, int(limit))]}
+        # Index is already in result order, so stop at the first `limit` matches
+        ql = q.strip().lower() if q else ""
+        matches = (item for name_l, item in index if ql in name_l)
+        return {"items": list(islice(matches, max(1, int(limit))))}
     except Exception as e:
         logger.error(f"Failed to search menu items: {e}")
         raise HTTPException(status_code=500, detail="Failed to search menu items")
 
 
 @router.get("/image/presign")
-def presign_image(
+async def presign_image(
     request: Request, key: str = Query(..., min_length=3)
 ) -> Dict[str, str]:
     try:
-        # Small in-memory cache to reduce AWS bursts when multiple auditors open the same scan
-        now = time.time()
-        cache_entry = _presign_cache["map"].get(key)
-        if (
-            cache_entry
-            and isinstance(cache_entry, dict)
-            and cache_entry.get("exp", 0) > now + 60
-        ):  # still valid for at least 60s
-            return {"url": cache_entry["url"]}
-
-        url = request.app.state.aws_service.get_optimized_presigned_url(
-            key, target_width=1600, image_format="WEBP", quality=70
+        # Shared cache reduces AWS bursts when multiple auditors open the same scan
+        url = _presign_cache.get(
+            (key, 1600, "WEBP", 70), min_ttl=_PRESIGN_MIN_REMAINING_SECONDS
         )
+        if not url:
+            url = await asyncio.get_running_loop().run_in_executor(
+                request.app.state.presign_executor,
+                _cached_presign,
+                request.app.state.aws_service,
+                key,
+                1600,
+                "WEBP",
+                70,
+            )
         if not url:
             raise HTTPException(status_code=404, detail="Unable to presign image")
-        # Assume 30 minutes validity by default to avoid frequent churn
-        _presign_cache["map"][key] = {"url": url, "exp": now + 25 * 60}
         return {"url": url}
     except Exception as e:
         logger.error(f"Failed to presign image: {e}")
         raise HTTPException(status_code=500, detail="Failed to presign image")
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
 @router.get("/scans_to_audit")
-def get_scans_to_audit(
+async def get_scans_to_audit(
     request: Request,
     restaurantId: Optional[int] = None,
     date: Optional[str] = None,
@@ -884,7 +1224,7 @@ def get_scans_to_audit(
     # Prevent future-dated audits
     if date:
         try:
-            requested = datetime.strptime(date, "%Y-%m-%d").date()
+            requested = _validate_date(date)
         except ValueError:
             raise HTTPException(
                 status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
@@ -899,23 +1239,6 @@ def get_scans_to_audit(
     # Opportunistic background trigger: if many scans lack pan guesses, kick a smart retry
     # NOTE: Removed auto-trigger here per product requirement. The UI should explicitly call
     # a dedicated endpoint to start the pan AI workflow and show a waiting indicator.
-    # Fetch scans; if Dynamo is under load, do a quick backoff retry to smooth spikes
-    try:
-        scans = dynamo_service.get_scans_by_restaurant_day(restaurantId, date)
-    except Exception as e:
-        try:
-            logger.warning(
-                f"Primary get_scans_by_restaurant_day failed: {e}. Retrying once..."
-            )
-        except Exception:
-            pass
-        awaitable = None
-        try:
-            time.sleep(0.2)
-            scans = dynamo_service.get_scans_by_restaurant_day(restaurantId, date)
-        except Exception:
-            # Fall back to empty gracefully; UI will show propagation controls
-            scans = []
     # Safety: cap total records to prevent payload explosion; client can re-request next chunk if needed
     try:
         limit = int(request.query_params.get("limit", "1000"))
@@ -923,107 +1246,16 @@ def get_scans_to_audit(
             limit = 1000
     except Exception:
         limit = 1000
-    scans = scans[:limit]
-
-    def _to_float(value: Any, default: float = 0.0) -> float:
-        try:
-            return float(value)
-        except Exception:
-            return default
-
-    def _to_bool(value: Any) -> bool:
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, (int, float)):
-            return value != 0
-        if isinstance(value, str):
-            return value.strip().lower() in {"true", "1", "yes", "y"}
-        return False
-
-    def _has_pan_id(scan: dict) -> bool:
-        # Treat auditor-updated fields as valid identifiers
-        pan_id = (
-            scan.get("auditorPanId")
-            or scan.get("auditedPanId")
-            or scan.get("panId")
-            or scan.get("PanID")
-            or scan.get("pan_id")
-        )
-        if isinstance(pan_id, str) and pan_id.strip().lower() in {
-            "unrecognized",
-            "unknown",
-            "none",
-            "",
-        }:
-            pan_id = None
-        return pan_id is not None
-
-    def _has_menu_id(scan: dict) -> bool:
-        menu_id = (
-            scan.get("auditorMenuItemId")
-            or scan.get("auditedMenuItemId")
-            or scan.get("menuItemId")
-            or scan.get("MenuItemID")
-            or scan.get("reportedMenuItemId")
-        )
-        return menu_id is not None
-
-    def _is_empty_scan(scan: dict) -> bool:
-        if (
-            _to_bool(scan.get("isEmpty"))
-            or _to_bool(scan.get("empty"))
-            or _to_bool(scan.get("emptyScan"))
-            or _to_bool(scan.get("IsEmptyScan"))
-        ):
-            return True
-        reason = (
-            (scan.get("panAuditReason") or scan.get("reason") or scan.get("tags") or "")
-            .__str__()
-            .lower()
-        )
-        return "empty" in reason
-
-    def _is_non_food(scan: dict) -> bool:
-        if (
-            _to_bool(scan.get("nonFood"))
-            or _to_bool(scan.get("isNonFood"))
-            or _to_bool(scan.get("non_food"))
-        ):
-            return True
-        label = (
-            (
-                scan.get("classification")
-                or scan.get("label")
-                or scan.get("panAuditReason")
-                or ""
-            )
-            .__str__()
-            .lower()
+    # Throttling is retried with backoff by the DynamoDB client itself; the cap
+    # is pushed down so paging stops once `limit` scans have been read
+    try:
+        scans = await asyncio.to_thread(
+            dynamo_service.get_scans_by_restaurant_day, restaurantId, date, limit
         )
-        return ("non food" in label) or ("non-food" in label) or ("nonfood" in label)
-
-    def _is_bad_scan(scan: dict) -> bool:
-        # Rule 1: < 8oz and no panId and no menuItemId
-        weight_under = _to_float(scan.get("weight"), 0.0) < 8.0
-        no_ids = (not _has_pan_id(scan)) and (not _has_menu_id(scan))
-        if weight_under and no_ids:
-            return True
-        # Rule 2: empty scans
-        if _is_empty_scan(scan):
-            return True
-        # Rule 3: non-food on scale
-        if _is_non_food(scan):
-            return True
-        return False
-
-    def _is_deleted_scan(scan: dict) -> bool:
-        status = (
-            (scan.get("auditStatus") or scan.get("AuditStatus") or "")
-            .__str__()
-            .strip()
-            .lower()
+    except Exception:
+        raise HTTPException(
+            status_code=503, detail="Scans are temporarily unavailable. Retry shortly."
         )
-        return status == "deleted"
 
     # Do not presign images here; return scans quickly and let the UI request
     # a presigned URL only for the currently viewed scan.
@@ -1040,38 +1272,33 @@ def get_scans_to_audit(
                 except Exception:
                     pass
 
-                def _run_targeted() -> None:
-                    try:
-                        # Ensure repo/audit on path lazily
-                        import sys as _sys
-                        from pathlib import Path as _Path
-
-                        backend_dir = _Path(__file__).resolve().parents[2]
-                        repo_root = backend_dir.parent
-                        audit_dir = repo_root / "audit_automation"
-                        if str(repo_root) not in _sys.path:
-                            _sys.path.insert(0, str(repo_root))
-                        if str(audit_dir) not in _sys.path:
-                            _sys.path.insert(0, str(audit_dir))
-
-                        # Download and populate for the requested date (no AI on date-click flow)
-                        asyncio.run(populate_audits_for_date(date, run_ai=False))
-                        trigger_smart_retry_background()
-                    except Exception as _e:
-                        try:
-                            logger.warning(f"Auto download failed for {date}: {_e}")
-                        except Exception:
-                            pass
-
-                threading.Thread(target=_run_targeted, daemon=True).start()
+                # Download and populate for the requested date (no AI on
+                # date-click flow), then kick the smart retry
+                _start_population(request.app, date)
         except Exception:
             pass
 
+    # Build the 1600px renditions the UI will presign in the background, so
+    # opening a scan does not wait on the resize
+    if results:
+        try:
+            request.app.state.aws_service.schedule_optimize(
+                (s.get("imageURL") for s in results),
+                widths=(1600,),
+                image_format="WEBP",
+                quality=70,
+            )
+        except Exception as e:
+            logger.warning(f"Could not schedule image renditions for {date}: {e}")
+
     # Exclude deleted scans from normal; include them in invalid after they are persisted
-    normal_scans = [
-        s for s in results if not _is_bad_scan(s) and not _is_deleted_scan(s)
-    ]
-    flagged_scans = [s for s in results if _is_bad_scan(s) or _is_deleted_scan(s)]
+    normal_scans: List[Dict[str, Any]] = []
+    flagged_scans: List[Dict[str, Any]] = []
+    for s in results:
+        if is_deleted_scan(s) or is_bad_scan(s, AUDITED_PAN_KEYS, AUDITED_MENU_KEYS):
+            flagged_scans.append(s)
+        else:
+            normal_scans.append(s)
 
     # If propagation just finished but scans are empty, hint noData to help the UI exit loading state
     if not normal_scans and not flagged_scans:
@@ -1085,11 +1312,8 @@ def get_scans_to_audit(
 
     state = get_propagation_state(date)
     ai = get_ai_state(date) if date else {"running": False, "completedAt": None}
-    if date and not ai.get("running", False):
-        try:
-            ai["coverage"] = compute_coverage_for_date(date)
-        except Exception:
-            pass
+    if date:
+        _schedule_coverage_refresh(request.app, date)
     response_data: Dict[str, Any] = {"scans": normal_scans}
     if includeBad:
         response_data["flagged"] = flagged_scans
@@ -1099,13 +1323,18 @@ def get_scans_to_audit(
     response_data["aiRunning"] = ai.get("running", False)
     response_data["aiCompletedAt"] = ai.get("completedAt")
     response_data["aiCoverage"] = ai.get("coverage")
-    # Lightweight ETag-ish stamp for clients to avoid repainting if unchanged
-    try:
-        response_data["stamp"] = f"{len(results)}-{int(time.time() // 5)}"
-    except Exception:
-        response_data["stamp"] = None
 
-    return response_data
+    # Content hash doubles as the ETag and the `stamp` clients compare to skip
+    # repaints; a matching If-None-Match gets an empty 304
+    body = json_dumps(response_data)
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # Splice the stamp into the already-serialized object instead of encoding
+    # up to `limit` scans a second time
+    body = body[:-1] + b',"stamp":"' + etag.encode() + b'"}'
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # ========== AUDIT SESSION ENDPOINTS ==========
@@ -1120,8 +1349,11 @@ async def create_audit_session(
     """
     try:
         audit_service = request.app.state.audit_service
-        result = audit_service.create_audit_session(
-            restaurant_id=restaurant_id, date=date, auditor_id=auditor_id
+        result = await asyncio.to_thread(
+            audit_service.create_audit_session,
+            restaurant_id=restaurant_id,
+            date=date,
+            auditor_id=auditor_id,
         )
         if not result.get("success", False):
             # Block entrance if an active session exists
@@ -1150,7 +1382,9 @@ async def get_audit_session(request: Request, session_id: str) -> Dict[str, Any]
     """
     try:
         audit_service = request.app.state.audit_service
-        session_data = audit_service.get_audit_session(session_id)
+        session_data = await asyncio.to_thread(
+            audit_service.get_audit_session, session_id
+        )
 
         if not session_data:
             raise HTTPException(
@@ -1178,7 +1412,9 @@ async def get_audit_sessions_by_restaurant(
     """
     try:
         dynamo_service = request.app.state.dynamo_service
-        sessions = dynamo_service.get_audit_sessions_by_restaurant(restaurant_id, limit)
+        sessions = await asyncio.to_thread(
+            dynamo_service.get_audit_sessions_by_restaurant, restaurant_id, limit
+        )
 
         return {
             "success": True,
@@ -1218,8 +1454,10 @@ async def confirm_audit_session(
             }
 
         # Apply audit actions
-        result = audit_service.apply_audit_actions(
-            audit_request.session_id, audit_request.actions
+        result = await asyncio.to_thread(
+            audit_service.apply_audit_actions,
+            audit_request.session_id,
+            audit_request.actions,
         )
 
         # Prepare response
@@ -1234,6 +1472,8 @@ async def confirm_audit_session(
 
         return response
 
+    except AuditSessionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to confirm audit session {audit_request.session_id}: {e}")
         raise HTTPException(
@@ -1263,7 +1503,9 @@ async def apply_audit_actions(
             actions_to_apply.append(action_data)
 
         # Apply actions
-        results = skoopin_service.apply_audit_actions(actions_to_apply, restaurant_id)
+        results = await asyncio.to_thread(
+            skoopin_service.apply_audit_actions, actions_to_apply, restaurant_id
+        )
 
         return {
             "success": results["success"],
@@ -1288,7 +1530,9 @@ async def get_audit_progress(request: Request, session_id: str) -> Dict[str, Any
     """
     try:
         audit_service = request.app.state.audit_service
-        session_data = audit_service.get_audit_session(session_id)
+        session_data = await asyncio.to_thread(
+            audit_service.get_audit_session, session_id
+        )
 
         if not session_data:
             raise HTTPException(
@@ -1314,7 +1558,7 @@ async def get_audit_summary(request: Request, session_id: str) -> Dict[str, Any]
     """
     try:
         audit_service = request.app.state.audit_service
-        summary = audit_service.get_audit_summary(session_id)
+        summary = await asyncio.to_thread(audit_service.get_audit_summary, session_id)
 
         if "error" in summary:
             raise HTTPException(
@@ -1366,7 +1610,8 @@ async def comprehensive_audit_crud(
         session_id = audit_request.session_id
         if not session_id:
             # Create new session
-            session_result = audit_service.create_audit_session(
+            session_result = await asyncio.to_thread(
+                audit_service.create_audit_session,
                 restaurant_id=audit_request.restaurant_id,
                 date=audit_request.date,
                 auditor_id=audit_request.auditor_id,
@@ -1374,10 +1619,12 @@ async def comprehensive_audit_crud(
             session_id = session_result["session_id"]
 
         # Step 3: Apply audit actions (handles both Skoopin and DynamoDB updates)
-        result = audit_service.apply_audit_actions(session_id, audit_request.actions)
+        result = await asyncio.to_thread(
+            audit_service.apply_audit_actions, session_id, audit_request.actions
+        )
 
         # Step 4: Get updated audit summary
-        summary = audit_service.get_audit_summary(session_id)
+        summary = await asyncio.to_thread(audit_service.get_audit_summary, session_id)
 
         # Step 5: Prepare comprehensive response
         response = {
@@ -1397,6 +1644,8 @@ async def comprehensive_audit_crud(
 
         return response
 
+    except AuditSessionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to perform comprehensive CRUD operations: {e}")
         raise HTTPException(
@@ -1407,38 +1656,46 @@ async def comprehensive_audit_crud(
 
 @router.get("/audit/status/{restaurant_id}/{date}")
 async def get_comprehensive_audit_status(
-    request: Request, restaurant_id: int, date: str
+    request: Request, restaurant_id: int, date: str, verbose: bool = False
 ) -> Dict[str, Any]:
     """
     Get comprehensive audit status for a restaurant and date
     Shows both Skoopin and DynamoDB audit status
+    Full scan records are only included with ?verbose=1
     """
     try:
         dynamo_service = request.app.state.dynamo_service
         skoopin_service = request.app.state.skoopin_service
 
-        # Get scans from DynamoDB
-        dynamo_scans = dynamo_service.get_scans_by_restaurant_day(restaurant_id, date)
-
-        # Get audit sessions for this restaurant/date
-        audit_sessions = dynamo_service.get_audit_sessions_by_restaurant(restaurant_id)
-        relevant_sessions = [s for s in audit_sessions if s.get("date") == date]
-
-        # Calculate audit statistics
-        total_scans = len(dynamo_scans)
-        audited_scans = len([s for s in dynamo_scans if s.get("isAudited") == "true"])
-        deleted_scans = len(
-            [s for s in dynamo_scans if s.get("auditStatus") == "deleted"]
-        )
-        updated_scans = len(
-            [
-                s
-                for s in dynamo_scans
-                if s.get("auditStatus") and s.get("auditStatus") != "deleted"
-            ]
+        # Get scans (or just their audit fields) and this date's audit sessions
+        dynamo_scans, relevant_sessions = await asyncio.gather(
+            asyncio.to_thread(
+                (
+                    dynamo_service.get_scans_by_restaurant_day
+                    if verbose
+                    else dynamo_service.get_scan_audit_fields
+                ),
+                restaurant_id,
+                date,
+            ),
+            asyncio.to_thread(
+                dynamo_service.get_audit_sessions_for_date, restaurant_id, date
+            ),
         )
 
-        return {
+        # Calculate audit statistics in one pass
+        total_scans = len(dynamo_scans)
+        audited_scans = deleted_scans = updated_scans = 0
+        for s in dynamo_scans:
+            if s.get("isAudited") == "true":
+                audited_scans += 1
+            audit_status = s.get("auditStatus")
+            if audit_status == "deleted":
+                deleted_scans += 1
+            elif audit_status:
+                updated_scans += 1
+
+        result: Dict[str, Any] = {
             "success": True,
             "restaurant_id": restaurant_id,
             "date": date,
@@ -1454,8 +1711,10 @@ async def get_comprehensive_audit_status(
                 ),
             },
             "audit_sessions": relevant_sessions,
-            "scan_audit_status": dynamo_scans,
         }
+        if verbose:
+            result["scan_audit_status"] = dynamo_scans
+        return result
 
     except Exception as e:
         logger.error(f"Failed to get comprehensive audit status: {e}")
@@ -1472,7 +1731,7 @@ def submit_audits(request: Request, audits: dict = Body(...)) -> Dict[str, Any]:
         date_str = audits.get("date")
         if not date_str:
             raise HTTPException(status_code=400, detail="Missing date in payload.")
-        requested = datetime.strptime(date_str, "%Y-%m-%d").date()
+        requested = _validate_date(date_str)
     except Exception:
         raise HTTPException(
             status_code=400, detail="Invalid or missing date in payload."
@@ -1486,43 +1745,31 @@ def submit_audits(request: Request, audits: dict = Body(...)) -> Dict[str, Any]:
     audit_service = request.app.state.audit_service
     dynamo_service = request.app.state.dynamo_service
 
-    # Keep only actionable items
-    audits["actions"] = [
-        act
-        for act in audits.get("actions", [])
-        if act.get("delete")
-        or (act.get("panId") is not None and str(act.get("panId")).strip() != "")
-        or (
-            act.get("menuItemId") is not None
-            and str(act.get("menuItemId")).strip() != ""
-        )
-    ]
-
-    # Map incoming actions to typed AuditAction list
+    # Map incoming actions to typed AuditAction list in one pass; actions with
+    # no delete flag and blank pan/menu ids produce nothing
     typed_actions = []
-    for act in audits["actions"]:
+    for act in audits.get("actions", []):
         scan_id = str(act.get("scanId"))
+        pan_id = act.get("panId")
+        menu_item_id = act.get("menuItemId")
         if act.get("delete"):
             typed_actions.append(
                 AuditAction(scan_id=scan_id, action_type=AuditActionType.DELETE)
             )
-        if act.get("panId") is not None and str(act.get("panId")).strip() != "":
+        if pan_id is not None and (pan_str := str(pan_id)).strip():
             typed_actions.append(
                 AuditAction(
                     scan_id=scan_id,
                     action_type=AuditActionType.PAN_CHANGE,
-                    new_value=str(act.get("panId")),
+                    new_value=pan_str,
                 )
             )
-        if (
-            act.get("menuItemId") is not None
-            and str(act.get("menuItemId")).strip() != ""
-        ):
+        if menu_item_id is not None and (menu_str := str(menu_item_id)).strip():
             typed_actions.append(
                 AuditAction(
                     scan_id=scan_id,
                     action_type=AuditActionType.MENU_ITEM_CHANGE,
-                    new_value=str(act.get("menuItemId")),
+                    new_value=menu_str,
                 )
             )
 
@@ -1535,6 +1782,7 @@ def submit_audits(request: Request, audits: dict = Body(...)) -> Dict[str, Any]:
     apply_res = audit_service.apply_audit_actions(
         session_res["session_id"], typed_actions
     )
+    _invalidate_day_caches(date_str)
 
     ts = apply_res.get("timestamp")
     ts_str = ts.isoformat() if hasattr(ts, "isoformat") else ts
@@ -1599,12 +1847,9 @@ async def mark_run_completed(
 ) -> Dict[str, Any]:
     """Manually mark a scheduled run as completed for a specific date and time."""
     try:
-        from datetime import datetime
-        from pytz import timezone
-
         # Parse the date
         try:
-            run_date = datetime.strptime(date, "%Y-%m-%d").date()
+            run_date = _validate_date(date)
         except ValueError:
             raise HTTPException(
                 status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
@@ -1649,10 +1894,7 @@ async def mark_run_completed(
 async def test_scheduler() -> Dict[str, Any]:
     """Test endpoint to verify scheduler is working."""
     try:
-        from pytz import timezone
-
-        tz = timezone("America/Los_Angeles")
-        now = datetime.now(tz)
+        now = datetime.now(_PT_TZ)
 
         return {
             "success": True,
@@ -1671,40 +1913,51 @@ async def test_scheduler() -> Dict[str, Any]:
         )
 
 
+@lru_cache(maxsize=1)
+def _pan_download_fn():
+    # audit_automation is on sys.path (see module top); import it on first use
+    # so the server still boots without it, then reuse the function
+    from download_registered_pans import download_registered_pan_images
+
+    return download_registered_pan_images
+
+
+def _list_files(root: str) -> List[str]:
+    # Recursive scandir: the dirent already says file vs dir, so no extra
+    # stat per entry the way os.walk + os.path.join needs
+    files: List[str] = []
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(entry.path)
+    return files
+
+
 @router.post("/test/pan-download")
 async def test_pan_download(
     request: Request, restaurant_id: Optional[int] = None
 ) -> Dict[str, Any]:
     """Test endpoint to manually test pan download functionality."""
     try:
-        # Ensure repo root in path for audit_automation imports
-        import sys
-        from pathlib import Path
-
-        backend_dir = Path(__file__).resolve().parents[2]
-        repo_root = backend_dir.parent
-        audit_dir = repo_root / "audit_automation"
-        if str(audit_dir) not in sys.path:
-            sys.path.insert(0, str(audit_dir))
-
-        import os
-
         # Create a temporary test folder
         import tempfile
-        from download_registered_pans import download_registered_pan_images
+
+        download_registered_pan_images = _pan_download_fn()
 
         with tempfile.TemporaryDirectory() as temp_dir:
             logger.info(f"🧪 Testing pan download in temporary directory: {temp_dir}")
 
-            # Test the download function
-            result = download_registered_pan_images(temp_dir, restaurant_id)
+            # Test the download function (blocking S3/DB work, so in a thread)
+            result = await asyncio.to_thread(
+                download_registered_pan_images, temp_dir, restaurant_id
+            )
 
             # Check what was created
-            created_files = []
-            if os.path.exists(temp_dir):
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        created_files.append(os.path.join(root, file))
+            created_files = await asyncio.to_thread(_list_files, temp_dir)
 
             return {
                 "success": result,
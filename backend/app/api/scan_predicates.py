@@ -0,0 +1,133 @@
+"""
+Scan classification rules shared by the audit routes.
+
+Kept free of FastAPI/boto3 imports and written in plain, typed Python so the
+module can be compiled in place (e.g. ``cythonize -i`` or mypyc) for busy days;
+a compiled extension of the same name is picked up ahead of this file.
+"""
+
+from typing import Any
+
+_TRUTHY = frozenset({"true", "1", "yes", "y"})
+_INVALID_PAN = frozenset({"unrecognized", "unknown", "none", ""})
+_EMPTY_FLAGS = ("isEmpty", "empty", "emptyScan", "IsEmptyScan")
+_NON_FOOD_FLAGS = ("nonFood", "isNonFood", "non_food")
+_NON_FOOD_TOKENS = ("non food", "non-food", "nonfood")
+
+# Identifier fields in lookup order. The audit view also trusts the values an
+# auditor set, so those keys come first there.
+PAN_KEYS = ("panId", "PanID", "pan_id")
+MENU_KEYS = ("menuItemId", "MenuItemID", "reportedMenuItemId")
+AUDITED_PAN_KEYS = ("auditorPanId", "auditedPanId") + PAN_KEYS
+AUDITED_MENU_KEYS = ("auditorMenuItemId", "auditedMenuItemId") + MENU_KEYS
+
+
+def _to_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY
+    return False
+
+
+def _any_flag(scan: dict, keys: tuple) -> bool:
+    for key in keys:
+        if _to_bool(scan.get(key)):
+            return True
+    return False
+
+
+def _first_of(scan: dict, keys: tuple) -> Any:
+    # Same result as chaining scan.get(k1) or scan.get(k2) or ...
+    value = None
+    for key in keys:
+        value = scan.get(key)
+        if value:
+            return value
+    return value
+
+
+def has_pan_id(scan: dict, keys: tuple = PAN_KEYS) -> bool:
+    pan_id = _first_of(scan, keys)
+    if isinstance(pan_id, str) and pan_id.strip().lower() in _INVALID_PAN:
+        pan_id = None
+    return pan_id is not None
+
+
+def has_menu_id(scan: dict, keys: tuple = MENU_KEYS) -> bool:
+    return _first_of(scan, keys) is not None
+
+
+def _reason_mentions_empty(scan: dict) -> bool:
+    reason = str(
+        scan.get("panAuditReason") or scan.get("reason") or scan.get("tags") or ""
+    ).lower()
+    return "empty" in reason
+
+
+def _label_mentions_non_food(scan: dict) -> bool:
+    label = str(
+        scan.get("classification")
+        or scan.get("label")
+        or scan.get("panAuditReason")
+        or ""
+    ).lower()
+    return any(token in label for token in _NON_FOOD_TOKENS)
+
+
+def _text_mentions_empty_or_non_food(scan: dict) -> bool:
+    # Both texts usually come from panAuditReason; lower it only once then
+    audit_reason = scan.get("panAuditReason")
+    reason = audit_reason or scan.get("reason") or scan.get("tags") or ""
+    reason_lc = str(reason).lower()
+    if "empty" in reason_lc:
+        return True
+    label = scan.get("classification") or scan.get("label") or audit_reason or ""
+    label_lc = reason_lc if label is reason else str(label).lower()
+    return any(token in label_lc for token in _NON_FOOD_TOKENS)
+
+
+def is_empty_scan(scan: dict) -> bool:
+    return _any_flag(scan, _EMPTY_FLAGS) or _reason_mentions_empty(scan)
+
+
+def is_non_food(scan: dict) -> bool:
+    return _any_flag(scan, _NON_FOOD_FLAGS) or _label_mentions_non_food(scan)
+
+
+def is_bad_scan(
+    scan: dict, pan_keys: tuple = PAN_KEYS, menu_keys: tuple = MENU_KEYS
+) -> bool:
+    """Return True if a scan belongs in the flagged list.
+
+    A scan is bad if it is under 8oz with no pan or menu item (rule 1), is
+    empty (rule 2) or is non-food on the scale (rule 3). The rules are OR-ed,
+    so checks run cheapest first: flag fields before free-text scans.
+    ``pan_keys``/``menu_keys`` choose which identifier fields count for rule 1.
+    """
+    # Rule 1: < 8oz and no panId and no menuItemId (id lookups only when light)
+    if (
+        _to_float(scan.get("weight"), 0.0) < 8.0
+        and not has_pan_id(scan, pan_keys)
+        and not has_menu_id(scan, menu_keys)
+    ):
+        return True
+    # Rules 2 and 3 via explicit flags
+    if _any_flag(scan, _EMPTY_FLAGS) or _any_flag(scan, _NON_FOOD_FLAGS):
+        return True
+    # Rules 2 and 3 via reason/label text
+    return _text_mentions_empty_or_non_food(scan)
+
+
+def is_deleted_scan(scan: dict) -> bool:
+    status = scan.get("auditStatus") or scan.get("AuditStatus") or ""
+    return str(status).strip().lower() == "deleted"
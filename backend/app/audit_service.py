@@ -7,9 +7,11 @@ between the UI, DynamoDB, and Skoopin server.
 """
 
 import logging
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+from app.database_service import DatabaseService
 from app.dynamo_service import DynamoDBService
 from app.models import AuditAction, AuditActionType, AuditSession
 from app.skoopin_service import SkoopinService
@@ -17,16 +19,50 @@ from app.skoopin_service import SkoopinService
 logger = logging.getLogger(__name__)
 
 
+class AuditSessionConflict(Exception):
+    """Raised when another request is applying, or already applied, a session."""
+
+
+_VALID_ACTION_TYPES = frozenset(AuditActionType)
+# Action types that must carry a new_value
+_VALUE_ACTION_TYPES = frozenset(
+    {
+        AuditActionType.PAN_CHANGE,
+        AuditActionType.MENU_ITEM_CHANGE,
+        AuditActionType.VENUE_CHANGE,
+        AuditActionType.MEAL_PERIOD_CHANGE,
+    }
+)
+
+# Successful action type -> (auditStatus, auditAction, auditor*Id field to set)
+_SUCCESS_FIELDS = {
+    "delete": ("deleted", "deleted", None),
+    "pan_change": ("pan_updated", "pan_change", "auditorPanId"),
+    "menu_item_change": ("menu_item_updated", "menu_item_change", "auditorMenuItemId"),
+    "venue_change": ("venue_updated", "venue_change", "auditorVenueId"),
+    "meal_period_change": (
+        "meal_period_updated",
+        "meal_period_change",
+        "auditorMealPeriodId",
+    ),
+}
+
+
 class AuditService:
     """
     Service for managing audit sessions and operations
     """
 
     def __init__(
-        self, skoopin_service: SkoopinService, dynamo_service: DynamoDBService
+        self,
+        skoopin_service: SkoopinService,
+        dynamo_service: DynamoDBService,
+        database_service: Optional[DatabaseService] = None,
     ):
         self.skoopin_service = skoopin_service
         self.dynamo_service = dynamo_service
+        # Optional: only used to drop its cached reference pans after edits
+        self.database_service = database_service
 
     def create_audit_session(
         self, restaurant_id: int, date: str, auditor_id: Optional[str] = None
@@ -43,9 +79,14 @@ class AuditService:
             Session creation result
         """
         try:
-            # Get scans for this restaurant/date to determine total count
-            scans = self.dynamo_service.get_scans_by_restaurant_day(restaurant_id, date)
-            total_scans = len(scans) if scans else 0
+            # Count scans for this restaurant/date
+            try:
+                total_scans = self.dynamo_service.count_scans_by_restaurant_day(
+                    restaurant_id, date
+                )
+            except Exception as e:
+                logger.warning(f"Could not count scans for new session: {e}")
+                total_scans = 0
 
             # Create audit session
             session_id = self.dynamo_service.create_audit_session(
@@ -88,7 +129,9 @@ class AuditService:
                 return None
 
             # Get progress information
-            progress = self.dynamo_service.get_audit_progress(session_id)
+            progress = self.dynamo_service.get_audit_progress(
+                session_id, session=session
+            )
 
             return {"session": session, "progress": progress}
 
@@ -133,110 +176,107 @@ class AuditService:
             date = session["date"]
             auditor_id = session.get("auditorId")
 
-            fix_results = self.skoopin_service.apply_audit_actions(
-                actions_to_apply, restaurant_id
+            # Claim the session before touching Skoopin so two concurrent
+            # applies cannot both delete/patch the same scans
+            claimed_version = self.dynamo_service.claim_audit_session(
+                session_id, session.get("version", 0)
             )
+            if claimed_version is None:
+                raise AuditSessionConflict(
+                    f"Audit session {session_id} is already being applied or "
+                    f"is no longer in progress"
+                )
+
+            try:
+                fix_results = self.skoopin_service.apply_audit_actions(
+                    actions_to_apply, restaurant_id
+                )
+            except Exception:
+                # Nothing was recorded; hand the session back for a retry
+                self.dynamo_service.update_audit_session(
+                    session_id, {"status": "in_progress"}
+                )
+                raise
+
+            # Applied actions may have changed pans the reference cache holds
+            if fix_results["applied_actions"] and self.database_service is not None:
+                self.database_service.clear_reference_cache(restaurant_id)
+
+            # One timestamp for the session end, every scan and the response
+            now = datetime.utcnow()
+            now_iso = now.isoformat()
 
             # Update audit session with results
             session_updates = {
                 "status": "completed" if fix_results["success"] else "failed",
-                "endTime": datetime.utcnow().isoformat(),
+                "endTime": now_iso,
                 "actionsCount": fix_results["applied_actions"],
             }
 
-            self.dynamo_service.update_audit_session(session_id, session_updates)
+            # Version-checked against our claim; retried only while the
+            # session is still ours (e.g. a progress update bumped the version)
+            finalized = self.dynamo_service.update_audit_session(
+                session_id,
+                session_updates,
+                expected_version=claimed_version,
+                retry_if=lambda current: current.get("status") == "applying",
+            )
+            if not finalized:
+                raise AuditSessionConflict(
+                    f"Audit session {session_id} changed while its actions were "
+                    f"applied; scan audit statuses were not recorded"
+                )
 
             # Update scan audit status in DynamoDB for each action (successful or failed)
             successful_actions = 0
+            scan_updates = []
+            # Fields shared by every scan in this run; each scan gets its own
+            # dict built in one go from these plus its action-specific fields
+            common_fields = {
+                "auditSessionId": session_id,
+                "auditorId": auditor_id,
+                "auditedAt": now_iso,
+                "isAudited": "true",
+            }
             for i, result in enumerate(fix_results["action_results"]):
                 # Get the original action to extract scan details
                 original_action = actions[i]
 
-                # Prepare comprehensive audit data
-                audit_data = {
-                    "auditSessionId": session_id,
-                    "auditorId": auditor_id,
-                    "auditedAt": datetime.utcnow().isoformat(),
-                    "isAudited": "true",
-                }
-
                 # Set audit status based on action type and result
                 if result["success"]:
                     successful_actions += 1
 
-                    if original_action.action_type.value == "delete":
-                        audit_data.update(
-                            {
-                                "auditStatus": "deleted",
-                                "auditAction": "deleted",
-                                "auditResult": "success",
-                                "originalValue": original_action.original_value,
-                                "newValue": None,
-                            }
-                        )
-                    elif original_action.action_type.value == "pan_change":
-                        audit_data.update(
-                            {
-                                "auditStatus": "pan_updated",
-                                "auditAction": "pan_change",
-                                "auditResult": "success",
-                                "auditorPanId": original_action.new_value,
-                                "originalValue": original_action.original_value,
-                                "newValue": original_action.new_value,
-                            }
-                        )
-                    elif original_action.action_type.value == "menu_item_change":
-                        audit_data.update(
-                            {
-                                "auditStatus": "menu_item_updated",
-                                "auditAction": "menu_item_change",
-                                "auditResult": "success",
-                                "auditorMenuItemId": original_action.new_value,
-                                "originalValue": original_action.original_value,
-                                "newValue": original_action.new_value,
-                            }
-                        )
-                    elif original_action.action_type.value == "venue_change":
-                        audit_data.update(
-                            {
-                                "auditStatus": "venue_updated",
-                                "auditAction": "venue_change",
-                                "auditResult": "success",
-                                "auditorVenueId": original_action.new_value,
-                                "originalValue": original_action.original_value,
-                                "newValue": original_action.new_value,
-                            }
-                        )
-                    elif original_action.action_type.value == "meal_period_change":
-                        audit_data.update(
-                            {
-                                "auditStatus": "meal_period_updated",
-                                "auditAction": "meal_period_change",
-                                "auditResult": "success",
-                                "auditorMealPeriodId": original_action.new_value,
-                                "originalValue": original_action.original_value,
-                                "newValue": original_action.new_value,
-                            }
-                        )
+                    status, action_name, id_field = _SUCCESS_FIELDS[
+                        original_action.action_type.value
+                    ]
+                    audit_data = {
+                        **common_fields,
+                        "auditStatus": status,
+                        "auditAction": action_name,
+                        "auditResult": "success",
+                        "originalValue": original_action.original_value,
+                        "newValue": original_action.new_value if id_field else None,
+                    }
+                    if id_field:
+                        audit_data[id_field] = original_action.new_value
                 else:
                     # Action failed - still track the attempt
-                    audit_data.update(
-                        {
-                            "auditStatus": "failed",
-                            "auditAction": original_action.action_type.value,
-                            "auditResult": "failed",
-                            "auditError": result.get("error", "Unknown error"),
-                            "originalValue": original_action.original_value,
-                            "newValue": original_action.new_value,
-                        }
-                    )
-
-                # Update scan audit status in DynamoDB
-                self.dynamo_service.update_scan_audit_status(
-                    restaurant_id=restaurant_id,
-                    date=date,
-                    scan_id=original_action.scan_id,
-                    audit_data=audit_data,
+                    audit_data = {
+                        **common_fields,
+                        "auditStatus": "failed",
+                        "auditAction": original_action.action_type.value,
+                        "auditResult": "failed",
+                        "auditError": result.get("error", "Unknown error"),
+                        "originalValue": original_action.original_value,
+                        "newValue": original_action.new_value,
+                    }
+
+                scan_updates.append((original_action.scan_id, audit_data))
+
+            # Write all scan audit statuses in batched DynamoDB transactions
+            if scan_updates:
+                self.dynamo_service.batch_update_scan_audit_status(
+                    restaurant_id=restaurant_id, date=date, updates=scan_updates
                 )
 
             return {
@@ -245,73 +285,89 @@ class AuditService:
                 "applied_actions": fix_results["applied_actions"],
                 "failed_actions": fix_results["failed_actions"],
                 "errors": fix_results["errors"],
-                "timestamp": datetime.utcnow(),
+                "timestamp": now,
             }
 
+        except AuditSessionConflict as e:
+            logger.warning(str(e))
+            raise
         except Exception as e:
             logger.error(f"Failed to apply audit actions for session {session_id}: {e}")
             raise
 
-    def validate_audit_actions(self, actions: List[AuditAction]) -> Dict[str, Any]:
+    @staticmethod
+    def _iter_action_errors(actions: List[AuditAction]) -> Iterator[Dict[str, Any]]:
+        # Lazily, so callers that only need the first error stop there
+        for i, action in enumerate(actions):
+            # Check required fields
+            if not action.scan_id:
+                yield {"index": i, "error": "Missing scan_id"}
+
+            # Check action type validity
+            if action.action_type not in _VALID_ACTION_TYPES:
+                yield {
+                    "index": i,
+                    "scan_id": action.scan_id,
+                    "error": f"Invalid action type: {action.action_type}",
+                }
+
+            # Check value requirements based on action type
+            if action.action_type in _VALUE_ACTION_TYPES and not action.new_value:
+                yield {
+                    "index": i,
+                    "scan_id": action.scan_id,
+                    "error": f"Missing new_value for action type {action.action_type}",
+                }
+
+    def validate_audit_actions(
+        self, actions: List[AuditAction], fail_fast: bool = False
+    ) -> Dict[str, Any]:
         """
         Validate audit actions before applying them
 
         Args:
             actions: List of audit actions to validate
+            fail_fast: Stop at the first error (no warnings are collected then)
 
         Returns:
             Validation results
         """
         validation_results = {"valid": True, "errors": [], "warnings": []}
 
-        for i, action in enumerate(actions):
-            # Check required fields
-            if not action.scan_id:
-                validation_results["errors"].append(
-                    {"index": i, "error": "Missing scan_id"}
-                )
-                validation_results["valid"] = False
-
-            # Check action type validity
-            if action.action_type not in AuditActionType:
-                validation_results["errors"].append(
-                    {
-                        "index": i,
-                        "scan_id": action.scan_id,
-                        "error": f"Invalid action type: {action.action_type}",
-                    }
-                )
-                validation_results["valid"] = False
+        for error in self._iter_action_errors(actions):
+            validation_results["errors"].append(error)
+            validation_results["valid"] = False
+            if fail_fast:
+                return validation_results
 
-            # Check value requirements based on action type
-            if action.action_type in [
-                AuditActionType.PAN_CHANGE,
-                AuditActionType.MENU_ITEM_CHANGE,
-                AuditActionType.VENUE_CHANGE,
-                AuditActionType.MEAL_PERIOD_CHANGE,
-            ]:
-                if not action.new_value:
-                    validation_results["errors"].append(
-                        {
-                            "index": i,
-                            "scan_id": action.scan_id,
-                            "error": f"Missing new_value for action type {action.action_type}",
-                        }
-                    )
-                    validation_results["valid"] = False
-
-            # Check for duplicate scan actions
-            scan_actions = [a for a in actions if a.scan_id == action.scan_id]
-            if len(scan_actions) > 1:
+        # Check for duplicate scan actions (one warning per scan)
+        scan_counts = Counter(action.scan_id for action in actions)
+        for scan_id, count in scan_counts.items():
+            if count > 1:
                 validation_results["warnings"].append(
                     {
-                        "scan_id": action.scan_id,
-                        "warning": f"Multiple actions for scan {action.scan_id}",
+                        "scan_id": scan_id,
+                        "warning": f"Multiple actions for scan {scan_id}",
                     }
                 )
 
         return validation_results
 
+    def validate_audit_actions_quick(self, actions: List[AuditAction]) -> bool:
+        """
+        Pre-flight check: True if the actions have no validation errors
+
+        Args:
+            actions: List of audit actions to validate
+
+        Returns:
+            Whether the actions are valid
+        """
+        # Missing scan_id is the common client bug; reject that before anything
+        if any(not action.scan_id for action in actions):
+            return False
+        return next(self._iter_action_errors(actions), None) is None
+
     def get_audit_summary(self, session_id: str) -> Dict[str, Any]:
         """
         Get a summary of audit session results
@@ -327,16 +383,15 @@ class AuditService:
             if not session:
                 return {"error": "Session not found"}
 
-            progress = self.dynamo_service.get_audit_progress(session_id)
+            progress = self.dynamo_service.get_audit_progress(
+                session_id, session=session
+            )
 
             # Get restaurant name
             restaurant_id = session["restaurantId"]
-            restaurants = self.skoopin_service.get_restaurants()
-            restaurant_name = "Unknown"
-            for restaurant in restaurants:
-                if restaurant["id"] == restaurant_id:
-                    restaurant_name = restaurant["name"]
-                    break
+            restaurant_name = self.skoopin_service.get_restaurant_name_map().get(
+                restaurant_id, "Unknown"
+            )
 
             return {
                 "session_id": session_id,
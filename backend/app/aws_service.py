@@ -1,17 +1,90 @@
 import boto3
 import gzip
 import io
-import json
 import numpy as np
+import orjson
 import os
 import pandas as pd
 import pickle
-import struct
+import re
+import tempfile
+import threading
 import zipfile
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import timedelta
 from PIL import Image
+from typing import Iterable
 
 from app.utils.config import get_config
+from app.utils.embedding_codec import dump_embeddings, load_embeddings, sidecar_key
+from app.utils.ttl_cache import TTLCache
+
+_UNZIP_WORKERS = 8
+_SLASH_RUNS = re.compile(r"/{2,}")
+
+# Depth object "format" metadata values holding millimetres as uint16
+_DEPTH_U16_FORMATS = ("u16", "zstd-u16")
+
+
+def _open_depth_stream(body: bytes, depth_format: str | None):
+    if depth_format == "zstd-u16":
+        # Optional dependency, only needed once zstd depth objects exist
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body))
+    return gzip.GzipFile(fileobj=io.BytesIO(body))
+
+
+# How far an .npz sidecar may predate its .pkl and still be the same save
+_SIDECAR_WRITE_GAP = timedelta(seconds=60)
+
+
+def _is_missing(error: ClientError) -> bool:
+    code = error.response.get("Error", {}).get("Code")
+    return code in ("NoSuchKey", "404", "NotFound")
+
+
+def _decompress_into(
+    body: bytes, out: memoryview, depth_format: str | None = None
+) -> None:
+    """Decompress a depth ``body`` into ``out``; its size must match exactly."""
+    filled = 0
+    with _open_depth_stream(body, depth_format) as stream:
+        while filled < len(out):
+            n = stream.readinto(out[filled:])
+            if not n:
+                break
+            filled += n
+        if filled != len(out) or stream.read(1):
+            raise ValueError("Depth payload size does not match width x height")
+
+
+def _extract_member(zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, path) -> None:
+    try:
+        zip_ref.extract(member, path)
+    except FileExistsError:
+        # Another thread created the same parent directory first
+        zip_ref.extract(member, path)
+
+
+def _extract_zip_parallel(zip_ref: zipfile.ZipFile, path) -> None:
+    """Like ZipFile.extractall, with files written by a small thread pool."""
+    members = zip_ref.infolist()
+    # Directories first so file workers mostly find their parents in place
+    for member in members:
+        if member.is_dir():
+            zip_ref.extract(member, path)
+    files = [member for member in members if not member.is_dir()]
+    if len(files) < 2:
+        for member in files:
+            zip_ref.extract(member, path)
+        return
+    with ThreadPoolExecutor(max_workers=min(_UNZIP_WORKERS, len(files))) as pool:
+        # list() re-raises the first extraction error, as extractall would
+        list(pool.map(lambda member: _extract_member(zip_ref, member, path), files))
 
 
 class AWSService:
@@ -30,11 +103,20 @@ class AWSService:
         ):
             raise ValueError("Incomplete AWS configuration in the config file")
 
+        # Throttling/5xx are retried in botocore with client-side rate limiting;
+        # the pool covers the presign, rendition and transfer threads at once
+        s3_config = Config(
+            retries={"mode": "adaptive", "max_attempts": 10},
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            signature_version="s3v4",
+        )
         self.s3_resource = boto3.resource(
             "s3",
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
             region_name=region_name,
+            config=s3_config,
         )
         self.bucket = self.s3_resource.Bucket(bucket_name)
 
@@ -43,9 +125,34 @@ class AWSService:
             aws_access_key_id=aws_access_key_id,
             aws_secret_access_key=aws_secret_access_key,
             region_name=region_name,
+            config=s3_config,
+        )
+        # Large objects (model weights, unittest zips) download as parallel
+        # 16 MB ranged GETs
+        self._transfer_cfg = TransferConfig(
+            multipart_threshold=16 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=16,
+            io_chunksize=1024 * 1024,
+            use_threads=True,
         )
         self.ai_bucket_name = aws_config.get("ai_bucket_name")
         self.ai_bucket = self.s3_resource.Bucket(self.ai_bucket_name)
+        # (bucket, optimized key) pairs known to exist; renditions are never
+        # rewritten, so a hit lets presigning skip the HEAD round trip. Kept
+        # to an hour so an expired optimized/ object is not presigned for long
+        self._known_renditions: TTLCache[bool] = TTLCache(maxsize=50000, ttl=3600)
+        # Signed URLs per (bucket, key, expiry) so repeat requests skip SigV4
+        # signing. Kept for a quarter of their lifetime: the API layer caches
+        # what it gets from here for up to another ~40% on top.
+        self._url_cache: TTLCache[str] = TTLCache(maxsize=100000, ttl=900)
+        # Background pre-generation of renditions (see schedule_optimize)
+        self._rendition_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="aws-renditions"
+        )
+        self._renditions_pending: set[tuple[str, str]] = set()
+        self._renditions_lock = threading.Lock()
+        self._failed_renditions: TTLCache[bool] = TTLCache(maxsize=10000, ttl=600)
 
     def download_yolo_weights_from_s3(self, yolo_directory, local_file_path):
         version_text = os.path.join(yolo_directory, "latest_version.txt")
@@ -57,7 +164,9 @@ class AWSService:
         latest_version = version_buffer.read().decode("utf-8").strip()
         latest_yolo_folder = os.path.join(yolo_directory, latest_version)
         latest_yolo = os.path.join(latest_yolo_folder, "model.pt")
-        self.s3_client.download_file(self.ai_bucket_name, latest_yolo, local_file_path)
+        self.s3_client.download_file(
+            self.ai_bucket_name, latest_yolo, local_file_path, Config=self._transfer_cfg
+        )
 
     def read_image_from_s3(self, key, bucket=None):
         bucket = self.bucket if bucket is None else bucket
@@ -73,12 +182,8 @@ class AWSService:
             return False
 
     def _ensure_dir_key(self, key: str) -> str:
-        # avoid accidental '//' in keys
-        while "//" in key:
-            key = key.replace("//", "/")
-        if key.startswith("/"):
-            key = key[1:]
-        return key
+        # avoid accidental '//' in keys (one pass) and a leading '/'
+        return _SLASH_RUNS.sub("/", key).lstrip("/")
 
     def get_optimized_presigned_url(
         self,
@@ -90,10 +195,12 @@ class AWSService:
         quality: int = 75,
         cache_max_age_seconds: int = 7 * 24 * 3600,
         presign_seconds: int = 3600,
+        high_quality: bool = False,
     ) -> str:
         """
         Create (if needed) a web-optimized rendition for the given S3 object and return a presigned URL.
         If key is an http(s) URL, returns it as-is.
+        ``high_quality`` uses the slowest WEBP effort (for offline pre-generation).
         """
         try:
             if key.startswith("http://") or key.startswith("https://"):
@@ -105,8 +212,13 @@ class AWSService:
             # Optimized key path under same bucket
             optimized_key = self._ensure_dir_key(f"optimized/w{target_width}/{key}")
 
-            # If exists, return presigned
-            if self._object_exists(resolved_bucket, optimized_key):
+            # If exists, return presigned; only a cache miss pays the HEAD
+            rendition = (resolved_bucket, optimized_key)
+            exists = self._known_renditions.get(rendition)
+            if not exists and self._object_exists(resolved_bucket, optimized_key):
+                self._known_renditions.set(rendition, True)
+                exists = True
+            if exists:
                 return self.generate_presigned_url(
                     optimized_key,
                     expires_in_seconds=presign_seconds,
@@ -114,31 +226,15 @@ class AWSService:
                 )
 
             # Otherwise, read, resize, and upload
-            # Read original bytes
-            obj = self.s3_client.get_object(Bucket=resolved_bucket, Key=key)
-            original_bytes = obj["Body"].read()
-            pil_img = Image.open(io.BytesIO(original_bytes)).convert("RGB")
-            # Compute new size keeping aspect ratio
-            width, height = pil_img.size
-            if width > target_width:
-                new_height = int(height * (target_width / float(width)))
-                pil_img = pil_img.resize((target_width, new_height), Image.LANCZOS)
-            # Encode
-            buf = io.BytesIO()
-            fmt = "WEBP" if image_format.upper() == "WEBP" else "JPEG"
-            content_type = "image/webp" if fmt == "WEBP" else "image/jpeg"
-            if fmt == "WEBP":
-                pil_img.save(buf, format=fmt, quality=quality, method=6)
-            else:
-                pil_img.save(buf, format=fmt, quality=quality, optimize=True)
-            buf.seek(0)
-            # Upload optimized object
-            self.s3_client.put_object(
-                Bucket=resolved_bucket,
-                Key=optimized_key,
-                Body=buf.getvalue(),
-                ContentType=content_type,
-                CacheControl=f"public, max-age={cache_max_age_seconds}",
+            self._build_rendition(
+                resolved_bucket,
+                key,
+                optimized_key,
+                target_width=target_width,
+                image_format=image_format,
+                quality=quality,
+                cache_max_age_seconds=cache_max_age_seconds,
+                high_quality=high_quality,
             )
             # Presign
             return self.generate_presigned_url(
@@ -153,6 +249,165 @@ class AWSService:
                 key, expires_in_seconds=presign_seconds, bucket_name=bucket_name
             )
 
+    def _build_rendition(
+        self,
+        bucket_name: str,
+        key: str,
+        optimized_key: str,
+        *,
+        target_width: int,
+        image_format: str,
+        quality: int,
+        cache_max_age_seconds: int,
+        high_quality: bool,
+    ) -> None:
+        """Resize ``key`` to ``target_width`` and upload it as ``optimized_key``."""
+        # Read original bytes
+        obj = self.s3_client.get_object(Bucket=bucket_name, Key=key)
+        original_bytes = obj["Body"].read()
+        src_img = Image.open(io.BytesIO(original_bytes))
+        # Shrink-on-load: JPEG decodes at 1/2, 1/4 or 1/8 scale while still
+        # at least target_width wide (height 1 so only width constrains);
+        # a no-op for other formats. LANCZOS below sets the exact width.
+        src_img.draft("RGB", (target_width, 1))
+        # convert() always copies; most sources are already RGB after draft
+        pil_img = src_img if src_img.mode == "RGB" else src_img.convert("RGB")
+        # Downscale in place keeping aspect ratio (never enlarges): a cheap box
+        # reduce to within 2x of the target, then LANCZOS for the final step
+        pil_img.thumbnail((target_width, 10**9), Image.LANCZOS, reducing_gap=2.0)
+        # Encode
+        buf = io.BytesIO()
+        fmt = "WEBP" if image_format.upper() == "WEBP" else "JPEG"
+        content_type = "image/webp" if fmt == "WEBP" else "image/jpeg"
+        if fmt == "WEBP":
+            # method=6 is several times slower than 4 for a few % fewer bytes;
+            # not worth it while a viewer is waiting on the first request
+            method = 6 if high_quality else 4
+            pil_img.save(buf, format=fmt, quality=quality, method=method)
+        else:
+            pil_img.save(
+                buf,
+                format=fmt,
+                quality=quality,
+                optimize=True,
+                progressive=True,
+                subsampling=2,  # 4:2:0
+            )
+        buf.seek(0)
+        # Upload optimized object straight from the buffer (getvalue() would
+        # copy the whole encoded image first)
+        self.s3_client.upload_fileobj(
+            buf,
+            bucket_name,
+            optimized_key,
+            ExtraArgs={
+                "ContentType": content_type,
+                "CacheControl": f"public, max-age={cache_max_age_seconds}",
+            },
+            Config=self._transfer_cfg,
+        )
+        self._known_renditions.set((bucket_name, optimized_key), True)
+
+    def schedule_optimize(
+        self,
+        keys: Iterable[str],
+        widths: tuple[int, ...] = (1600,),
+        *,
+        bucket_name: str | None = None,
+        image_format: str = "WEBP",
+        quality: int = 70,
+        cache_max_age_seconds: int = 7 * 24 * 3600,
+        high_quality: bool = False,
+    ) -> int:
+        """
+        Queue background creation of optimized renditions so the first viewer
+        finds them ready instead of waiting on get_optimized_presigned_url.
+        Renditions already known to exist, already queued or that failed
+        recently are skipped; get_optimized_presigned_url still builds inline
+        if asked before the background work is done.
+
+        Returns:
+            Number of renditions queued
+        """
+        resolved_bucket = bucket_name or self.bucket.name
+        queued = 0
+        for key in keys:
+            # Only S3 keys; full URLs are served as-is
+            if not isinstance(key, str) or not key:
+                continue
+            if key.startswith(("http://", "https://")):
+                continue
+            for width in widths:
+                optimized_key = self._ensure_dir_key(f"optimized/w{width}/{key}")
+                rendition = (resolved_bucket, optimized_key)
+                known = self._known_renditions.get(rendition)
+                if known or self._failed_renditions.get(rendition):
+                    continue
+                with self._renditions_lock:
+                    if rendition in self._renditions_pending:
+                        continue
+                    self._renditions_pending.add(rendition)
+                self._rendition_executor.submit(
+                    self._pregenerate_rendition,
+                    resolved_bucket,
+                    key,
+                    optimized_key,
+                    target_width=width,
+                    image_format=image_format,
+                    quality=quality,
+                    cache_max_age_seconds=cache_max_age_seconds,
+                    high_quality=high_quality,
+                )
+                queued += 1
+        return queued
+
+    def _pregenerate_rendition(
+        self, bucket_name: str, key: str, optimized_key: str, **kwargs
+    ) -> None:
+        rendition = (bucket_name, optimized_key)
+        try:
+            if self._object_exists(bucket_name, optimized_key):
+                self._known_renditions.set(rendition, True)
+            else:
+                self._build_rendition(bucket_name, key, optimized_key, **kwargs)
+        except Exception as e:
+            # Missing or unreadable original; do not retry it on every poll
+            self._failed_renditions.set(rendition, True)
+            print(f"Failed to pre-generate rendition {optimized_key}: {e}")
+        finally:
+            with self._renditions_lock:
+                self._renditions_pending.discard(rendition)
+
+    def close(self) -> None:
+        self._rendition_executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_optimized_presigned_urls_batch(
+        self,
+        keys: list[str],
+        *,
+        executor: Executor | None = None,
+        max_workers: int = 16,
+        **kwargs,
+    ) -> list[str]:
+        """
+        get_optimized_presigned_url for many keys, with the S3 round trips
+        (HEAD, and GET/PUT for missing renditions) run concurrently.
+        Duplicate keys are signed once. Pass ``executor`` to reuse a shared
+        pool instead of starting a temporary one.
+        """
+        unique = list(dict.fromkeys(keys))
+
+        def presign(key: str) -> str:
+            return self.get_optimized_presigned_url(key, **kwargs)
+
+        if executor is not None:
+            urls = dict(zip(unique, executor.map(presign, unique)))
+        else:
+            workers = max(1, min(max_workers, len(unique)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                urls = dict(zip(unique, pool.map(presign, unique)))
+        return [urls[key] for key in keys]
+
     def generate_presigned_url(
         self,
         key: str,
@@ -164,28 +419,72 @@ class AWSService:
             bucket_name = bucket_name or (
                 self.ai_bucket_name if use_ai_bucket else self.bucket.name
             )
-            return self.s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": bucket_name, "Key": key},
-                ExpiresIn=expires_in_seconds,
-            )
+            cache_key = (bucket_name, key, expires_in_seconds)
+            url = self._url_cache.get(cache_key)
+            if url is None:
+                url = self.s3_client.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": bucket_name, "Key": key},
+                    ExpiresIn=expires_in_seconds,
+                )
+                self._url_cache.set(cache_key, url, ttl=max(1, expires_in_seconds // 4))
+            return url
         except Exception as e:
             print(f"Failed to create presigned url for {key}: {e}")
             return ""
 
+    def _read_npz_embeddings(self, pickle_key):
+        # Pickle-free copy written next to the .pkl; None if there is none yet,
+        # or if it is older than the .pkl (a writer that could not encode it)
+        try:
+            sidecar = self.s3_client.head_object(
+                Bucket=self.ai_bucket_name, Key=sidecar_key(pickle_key)
+            )
+            pickled = self.s3_client.head_object(
+                Bucket=self.ai_bucket_name, Key=pickle_key
+            )
+        except ClientError as e:
+            if _is_missing(e):
+                return None
+            raise
+        # The sidecar is uploaded just before its .pkl, so allow for that gap
+        if sidecar["LastModified"] + _SIDECAR_WRITE_GAP < pickled["LastModified"]:
+            return None
+        try:
+            response = self.ai_bucket.Object(sidecar_key(pickle_key)).get()
+        except ClientError as e:
+            if _is_missing(e):
+                return None
+            raise
+        return load_embeddings(response["Body"].read())
+
     def get_pan_embeddings(self, pickle_dir):
         try:
+            embeddings = self._read_npz_embeddings(pickle_dir)
+            if embeddings is not None:
+                return embeddings
             embedding_pickle = self.ai_bucket.Object(pickle_dir)
             embedding_data = embedding_pickle.get().get("Body").read()
             return pickle.load(io.BytesIO(embedding_data))
 
-        except:
+        except ClientError as e:
+            # Only a missing object means "no embeddings"; other errors surface
+            if not _is_missing(e):
+                raise
             print("No Embeddings Found")
             return {}
 
     def save_embedding_to_s3(self, embeddings, key):
         try:
             pickle_data = pickle.dumps(embeddings)
+            # Also store the .npz form while readers migrate off pickle. It
+            # goes first so it is never newer than the .pkl it mirrors, and a
+            # sidecar that cannot be rewritten is removed rather than left stale
+            npz_data = dump_embeddings(embeddings)
+            if npz_data is not None:
+                self.ai_bucket.put_object(Key=sidecar_key(key), Body=npz_data)
+            else:
+                self.ai_bucket.Object(sidecar_key(key)).delete()
             self.ai_bucket.put_object(Key=key, Body=pickle_data)
             # print(f"Dictionary saved as pickle to s3://{self.ai_bucket_name}/{key}")
         except Exception as e:
@@ -197,77 +496,114 @@ class AWSService:
         image.save(buffer, format="JPEG")
         buffer.seek(0)
         try:
-            self.s3_client.upload_fileobj(buffer, self.ai_bucket_name, object_key)
+            self.s3_client.upload_fileobj(
+                buffer, self.ai_bucket_name, object_key, Config=self._transfer_cfg
+            )
             # print(f"Image successfully uploaded to s3://{self.ai_bucket_name}/{object_key}")
         except Exception as e:
             print(f"Error saving Image: {e}")
 
     def list_s3_objects(self, bucket_name, prefix):
+        # Paginated: a single list_objects_v2 call stops at 1000 keys
+        paginator = self.s3_client.get_paginator("list_objects_v2")
         return [
             obj["Key"]
-            for obj in self.s3_client.list_objects_v2(
-                Bucket=bucket_name, Prefix=prefix
-            ).get("Contents", [])
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    def list_s3_subfolders(self, bucket_name, prefix):
+        """Names of the immediate "folders" under ``prefix`` (which ends in /)."""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        # Strip the known prefix instead of splitting, so a name is exactly
+        # the segment S3 grouped on
+        return [
+            cp["Prefix"][len(prefix) :].rstrip("/")
+            for page in paginator.paginate(
+                Bucket=bucket_name, Prefix=prefix, Delimiter="/"
+            )
+            for cp in page.get("CommonPrefixes", [])
         ]
 
     def get_existing_pan_dimensions(self, resturaunt_id):
-        remove_prefix = lambda larger_string, prefix_to_remove: (
-            larger_string[len(prefix_to_remove) :]
-            if larger_string.startswith(prefix_to_remove)
-            else larger_string
-        )
         print(f"getting get_existing_pan_dimensions")
-        folders_name = set()
         resturaunt_prefix = f"pan_designs/{self.env}/{resturaunt_id}/"
-        # print(f'resturaunt_prefix = {resturaunt_prefix}')
-        prefixes = self.list_s3_objects(self.ai_bucket_name, resturaunt_prefix)
-
-        for prefix in prefixes:
-            # print(f'current prefix = {prefix}')
-            removed_prefix = remove_prefix(prefix, resturaunt_prefix)
-            if "/" not in removed_prefix:
-                continue
-            folder_name = removed_prefix.split("/")[0]
-            folders_name.add(folder_name)
-        return list(folders_name)
+        # Only the first path segment is needed, so list folders, not every key
+        return self.list_s3_subfolders(self.ai_bucket_name, resturaunt_prefix)
 
     def get_depth_array_from_s3(self, key, binary_depth_image=False):
-        object = self.bucket.Object(key)
-        # get object metadata
-        try:
-            metadata = object.get().get("Metadata")
-            width = int(metadata.get("width", 1280))
-            height = int(metadata.get("height", 720))
-        except:
-            pass
-        gzipped_depth = object.get().get("Body").read()
-        decompressed_depth = gzip.decompress(gzipped_depth)
+        # One GET for both the metadata and the body
+        response = self.s3_client.get_object(Bucket=self.bucket.name, Key=key)
+        metadata = response.get("Metadata") or {}
+        width = int(metadata.get("width", 1280))
+        height = int(metadata.get("height", 720))
+        depth_format = metadata.get("format")
+        body = response["Body"].read()
+        if depth_format in _DEPTH_U16_FORMATS:
+            # Millimetres as uint16 (see upload_depth_array_to_s3)
+            depth_mm = np.empty((height, width), dtype=np.uint16)
+            _decompress_into(body, memoryview(depth_mm).cast("B"), depth_format)
+            return depth_mm.astype(np.float32)
+        # Producers that tag the payload as raw float32 skip the JSON path
+        if depth_format == "float32":
+            binary_depth_image = True
         if binary_depth_image is True:
-            depth = (
-                np.frombuffer(decompressed_depth, dtype=np.float32).reshape(
-                    (height, width)
-                )
-                * 1000
-            )
+            # Inflate straight into the result array and scale it in place
+            depth = np.empty((height, width), dtype=np.float32)
+            _decompress_into(body, memoryview(depth).cast("B"))
         else:
-            depth_nested_list = json.loads(decompressed_depth.decode("utf-8"))
-            depth_2d = np.array(depth_nested_list)
-            depth = np.asanyarray(depth_2d).astype(np.float32) * 1000
+            # Legacy nested-list JSON: orjson parses it much faster than json,
+            # then convert straight to float32 and scale in place
+            depth = np.asarray(orjson.loads(gzip.decompress(body)), dtype=np.float32)
+            if depth.ndim == 1 and depth.size == height * width:
+                depth = depth.reshape((height, width))
+        np.multiply(depth, 1000, out=depth)
         return depth
 
+    def upload_depth_array_to_s3(self, depth_m, key, compression="gzip"):
+        """
+        Store a depth map (metres) as millimetre uint16, half the size of
+        float32; readable by get_depth_array_from_s3.
+        ``compression="zstd"`` needs the zstandard package.
+        """
+        depth_mm = np.clip(np.rint(np.asarray(depth_m) * 1000), 0, 65535)
+        raw = depth_mm.astype(np.uint16).tobytes()
+        if compression == "zstd":
+            import zstandard
+
+            body = zstandard.ZstdCompressor(level=3).compress(raw)
+            depth_format = "zstd-u16"
+        else:
+            body = gzip.compress(raw, compresslevel=6)
+            depth_format = "u16"
+        height, width = depth_mm.shape
+        self.bucket.put_object(
+            Key=key,
+            Body=body,
+            Metadata={
+                "format": depth_format,
+                "width": str(width),
+                "height": str(height),
+            },
+        )
+
     def upload_food_embedding_meta_data_to_s3(self, prefix, metadata_buffer):
         try:
             self.ai_bucket.put_object(Key=prefix, Body=metadata_buffer)
         except Exception as e:
             print(f"Error saving food metadata as: {e}")
 
-    def get_latest_food_embedding_metadata(self, restraurant_id, venue, version=None):
+    def get_latest_food_embedding_metadata(
+        self, restraurant_id, venue, version=None, columns=None
+    ):
         if not version:
             version = self.get_latest_food_embedding_version(restraurant_id, venue)
         try:
             if version:
                 base_metadata_prefix = f"metron/verified_embeddings/{restraurant_id}/{venue}/meta_data-{venue}-{restraurant_id}-{version}"
-                extensions = [".csv", ".parquet"]
+                # Parquet first: columnar and compressed, so it downloads and
+                # parses much faster than the CSV copy
+                extensions = [".parquet", ".csv"]
                 for ext in extensions:
                     metadata_prefix = base_metadata_prefix + ext
                     try:
@@ -276,9 +612,9 @@ class AWSService:
                         metadata_buffer = io.BytesIO(metadata)
                         # Read the file based on the extension
                         if ext == ".csv":
-                            return pd.read_csv(metadata_buffer)
+                            return pd.read_csv(metadata_buffer, usecols=columns)
                         elif ext == ".parquet":
-                            return pd.read_parquet(metadata_buffer)
+                            return pd.read_parquet(metadata_buffer, columns=columns)
                     except Exception as e:
                         print(
                             f"Failed to read file: {metadata_prefix}. Trying next option..."
@@ -312,7 +648,9 @@ class AWSService:
             if version:
                 return version
             return None
-        except Exception as e:
+        except ClientError as e:
+            if not _is_missing(e):
+                raise
             return None
 
     def get_latest_food_embedding(self, restaurant_id, venue):
@@ -320,6 +658,9 @@ class AWSService:
         if version:
             try:
                 embedding_path = f"{self.env}/food_classification/{restaurant_id}/{venue}/verified-embedding-{venue}-{restaurant_id}-{version}.pkl"
+                embeddings = self._read_npz_embeddings(embedding_path)
+                if embeddings is not None:
+                    return embeddings
                 venue_embedding = self.ai_bucket.Object(embedding_path)
                 response = venue_embedding.get()
                 embedding_data = response["Body"].read()
@@ -331,15 +672,13 @@ class AWSService:
 
     def search_for_food_embeddings_across_venues(self, restaurant_id, venue):
         restaurant_s3_path = f"metron/verified_embeddings/{restaurant_id}/"
-        directories_in_restaurant = self.s3_client.list_objects_v2(
-            Bucket=self.ai_bucket_name, Prefix=restaurant_s3_path, Delimiter="/"
-        )
-        other_venues_in_restaurant = [
-            cp["Prefix"].rstrip("/").split("/")[-1]
-            for cp in directories_in_restaurant.get("CommonPrefixes", [])
-            if cp["Prefix"].rstrip("/").split("/")[-1] != venue
+        return [
+            other_venue
+            for other_venue in self.list_s3_subfolders(
+                self.ai_bucket_name, restaurant_s3_path
+            )
+            if other_venue != venue
         ]
-        return other_venues_in_restaurant
 
     def upload_venue_specific_food_classification_unittest(
         self, unittest_prefix, unittest_buffer
@@ -355,11 +694,14 @@ class AWSService:
         print(f"Downloading unittest")
         try:
             s3_path = f"metron/unit_test_data/food_classification/{restaurant_id}/{venue}/menu_items_test_data.zip"
-            unittest_buffer = io.BytesIO()
-            self.ai_bucket.download_fileobj(s3_path, unittest_buffer)
-            unittest_buffer.seek(0)
-            with zipfile.ZipFile(unittest_buffer, "r") as zip_ref:
-                zip_ref.extractall(save_path)
+            # To a file on disk so the download can use parallel ranged GETs
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                zip_path = os.path.join(tmp_dir, "menu_items_test_data.zip")
+                self.s3_client.download_file(
+                    self.ai_bucket_name, s3_path, zip_path, Config=self._transfer_cfg
+                )
+                with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                    _extract_zip_parallel(zip_ref, save_path)
         except Exception as e:
             print(f" Failed to Download Unittest Data with Exception: {e}")
 
@@ -1,16 +1,126 @@
 import logging
+import orjson
 import os
 import pymysql
+import socket
 import stat
 import tempfile
 import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
 from sshtunnel import SSHTunnelForwarder
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from app.utils.config import get_config
+from app.utils.mysql_pool import ConnectionPool
+from app.utils.ttl_cache import TTLCache
+
+# Reference pans change rarely; /pans asks for the same restaurant/day on
+# every page load
+_REFERENCE_PANS_TTL = 60
+
+# Numeric columns that become 0.0 when NULL; every other NULL becomes ""
+_FLOAT_NULL_KEYS = frozenset({"Weight", "DetectedDepth", "Volume"})
+
+# Templated on the table alias; the 5.7 query filters Scans twice
+_SCAN_TS = "COALESCE({a}.UpdatedAt, {a}.CapturedAt, {a}.CreatedAt)"
+_LATEST_SCAN_ORDER = "{a}.UpdatedAt DESC, {a}.CapturedAt DESC, {a}.CreatedAt DESC"
+_REFERENCE_PANS_SELECT = (
+    "SELECT s.ID, s.Number, s.ShortID, s.PanID, s.MenuItemName, "
+    "s.DetectedSizeStandard, s.Weight, s.DetectedDepth, s.Volume, s.ImageURL, "
+    "s.DepthImageURL, s.Status, s.Type, s.CapturedAt, s.CreatedAt, s.UpdatedAt, "
+    "COALESCE(p.Shape, 'Unknown') as Shape, "
+    "COALESCE(p.SizeStandard, s.DetectedSizeStandard) as SizeStandard, "
+    "p.Data AS PansData, p.Depth AS PanDepth "
+)
 
 logger = logging.getLogger(__name__)
 
+# Probe idle MySQL sockets so a connection silently dropped by the tunnel
+# or a NAT is detected within ~a minute instead of on the next query
+_TCP_KEEPALIVE_OPTS = (
+    ("TCP_KEEPIDLE", 30),
+    ("TCP_KEEPINTVL", 10),
+    ("TCP_KEEPCNT", 3),
+)
+
+
+def _enable_keepalive(conn: pymysql.connections.Connection) -> None:
+    sock = getattr(conn, "_sock", None)
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for name, value in _TCP_KEEPALIVE_OPTS:
+            opt = getattr(socket, name, None)  # not every platform has all
+            if opt is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+    except OSError as e:
+        logger.warning(f"Could not enable TCP keepalive on MySQL socket: {e}")
+
+
+@lru_cache(maxsize=64)
+def _reference_pans_query(
+    n_types: int, n_pan_ids: int, with_date: bool, window: bool
+) -> str:
+    """
+    Build the latest-scan-per-pan SQL for a given filter shape
+
+    Args:
+        n_types: Number of Type values to match (0 for any type)
+        n_pan_ids: Number of PanIDs to match (0 for any pan)
+        with_date: Whether to add the [start, end) timestamp window
+        window: Use ROW_NUMBER() (MySQL 8+) instead of the 5.7 join
+
+    Returns:
+        SQL whose placeholders take restaurant ID, types, pan IDs, window
+        bounds (that filter twice for the 5.7 query) and finally the limit
+    """
+
+    def where_for(a: str) -> str:
+        where = [
+            f"{a}.RestaurantID = %s",
+            f"{a}.PanID IS NOT NULL",
+            f"{a}.Status <> 0",
+        ]
+        if n_types:
+            where.append(f"{a}.Type IN ({','.join(['%s'] * n_types)})")
+        if n_pan_ids:
+            where.append(f"{a}.PanID IN ({','.join(['%s'] * n_pan_ids)})")
+        if with_date:
+            ts = _SCAN_TS.format(a=a)
+            where.append(f"{ts} >= %s AND {ts} < %s")
+        return " AND ".join(where)
+
+    where_sql = where_for("s")
+    latest_order = _LATEST_SCAN_ORDER.format(a="s")
+    # Let MySQL keep only the latest row per PanID so a single row per pan
+    # crosses the tunnel instead of every historical scan
+    if window:
+        return (
+            f"{_REFERENCE_PANS_SELECT}"
+            "FROM (SELECT s.*, ROW_NUMBER() OVER ("
+            f"PARTITION BY s.PanID ORDER BY {latest_order}"
+            f") AS rn FROM Scans s WHERE {where_sql}) s "
+            "LEFT JOIN Pans p ON s.PanID = p.ID "
+            "WHERE s.rn = 1 "
+            "ORDER BY s.PanID ASC "
+            "LIMIT %s"
+        )
+    # MySQL 5.7: keep the row a correlated subquery ranks first for its pan,
+    # using the same ordering as ROW_NUMBER() above
+    return (
+        f"{_REFERENCE_PANS_SELECT}"
+        "FROM Scans s "
+        "LEFT JOIN Pans p ON s.PanID = p.ID "
+        f"WHERE {where_sql} "
+        "AND s.ID = (SELECT s2.ID FROM Scans s2 "
+        f"WHERE s2.PanID = s.PanID AND {where_for('s2')} "
+        f"ORDER BY {_LATEST_SCAN_ORDER.format(a='s2')} LIMIT 1) "
+        "ORDER BY s.PanID ASC "
+        "LIMIT %s"
+    )
+
 
 class DatabaseService:
     def __init__(self):
@@ -31,13 +141,22 @@ class DatabaseService:
         self.db_schema = db_config.get("db_schema")
         self.db_host = db_config.get("db_host") or "127.0.0.1"
         self.db_port = int(db_config.get("db_port") or 3306)
+        # Pooled connections for the query helpers; recycled well before
+        # MySQL's wait_timeout so a reused connection is never half-closed
+        self.pool_size = int(db_config.get("pool_size") or 8)
+        self.pool_lifetime = float(db_config.get("pool_lifetime") or 600)
 
         self.tunnel: SSHTunnelForwarder | None = None
         self.connection: pymysql.connections.Connection | None = None
         self._ssh_key_tempfile: str | None = None
+        self._ssh_key_path: str | None = None
         self._lock = threading.RLock()
         self._local_bind_host: str | None = None
         self._local_bind_port: int | None = None
+        self._pool: ConnectionPool | None = None
+        self._window_functions: bool | None = None
+        self._pan_cache: TTLCache[List[Dict]] = TTLCache(128, _REFERENCE_PANS_TTL)
+        self._pan_index: TTLCache[Dict] = TTLCache(128, _REFERENCE_PANS_TTL)
 
     def _resolve_ssh_key_path(self) -> str | None:
         """Resolve SSH private key to a filesystem path usable by paramiko.
@@ -96,6 +215,28 @@ class DatabaseService:
         logger.warning(f"SSH key path not found: {key_path}")
         return None
 
+    def _get_ssh_key_path(self) -> str | None:
+        """Resolve the SSH key once per process; call with ``self._lock`` held.
+
+        Reconnects reuse the resolved path instead of re-reading env/config and
+        rewriting the key file. A key file that disappeared is resolved again.
+        """
+        if self._ssh_key_path and os.path.exists(self._ssh_key_path):
+            return self._ssh_key_path
+        self._ssh_key_path = self._resolve_ssh_key_path()
+        return self._ssh_key_path
+
+    def reset_ssh_key(self) -> None:
+        """Forget the resolved SSH key so the next tunnel start re-reads it."""
+        with self._lock:
+            if self._ssh_key_tempfile:
+                try:
+                    os.remove(self._ssh_key_tempfile)
+                except OSError:
+                    pass
+            self._ssh_key_tempfile = None
+            self._ssh_key_path = None
+
     def _write_temp_ssh_key(self, pem: str) -> str:
         if self._ssh_key_tempfile and os.path.exists(self._ssh_key_tempfile):
             return self._ssh_key_tempfile
@@ -110,12 +251,16 @@ class DatabaseService:
         """Start a persistent SSH tunnel to the production database.
         Safe to call multiple times; it will no-op if already active.
         """
+        # Lock-free fast path; checked again under the lock before starting
+        tunnel = self.tunnel
+        if tunnel and getattr(tunnel, "is_active", False):
+            return True
         with self._lock:
             # Already active
             if self.tunnel and getattr(self.tunnel, "is_active", False):
                 return True
             try:
-                key_path = self._resolve_ssh_key_path()
+                key_path = self._get_ssh_key_path()
                 if not key_path:
                     raise RuntimeError("SSH private key not provided or not found")
                 # Use ephemeral local bind port to avoid collisions
@@ -125,7 +270,7 @@ class DatabaseService:
                     ssh_pkey=key_path,
                     remote_bind_address=(self.remote_host, int(self.remote_port)),
                     local_bind_address=("127.0.0.1", 0),
-                    set_keepalive=30,
+                    set_keepalive=15,
                     allow_agent=False,
                 )
                 self.tunnel.start()
@@ -144,6 +289,8 @@ class DatabaseService:
                             "127.0.0.1",
                             self.db_port,
                         )
+                # New tunnel, new local port: connections to the old one are dead
+                self._reset_pool()
                 logger.info(
                     f"SSH tunnel established to {self.ssh_host} -> {self.remote_host}:{self.remote_port} at {self._local_bind_host}:{self._local_bind_port}"
                 )
@@ -159,25 +306,8 @@ class DatabaseService:
                 self.tunnel = None
                 return False
 
-    def connect_db(self) -> bool:
-        """Connect to MySQL database through the persistent SSH tunnel."""
-        # Fast path under lock: return if already connected
-        with self._lock:
-            if self.connection:
-                try:
-                    self.connection.ping(reconnect=True)
-                    return True
-                except Exception:
-                    try:
-                        self.connection.close()
-                    except Exception:
-                        pass
-                    self.connection = None
-
-        # Start tunnel WITHOUT holding the lock, with timeout protection
-        import threading
-        import time
-
+    def _start_tunnel_with_timeout(self) -> bool:
+        """Start the tunnel WITHOUT holding the lock, with timeout protection."""
         # Use a thread with timeout to prevent hanging
         tunnel_result = {"success": False, "error": None}
 
@@ -198,21 +328,45 @@ class DatabaseService:
         )  # allow a bit more time on Cloud Run cold starts
 
         if tunnel_thread.is_alive():
-            logger.error("SSH tunnel startup timed out after 10 seconds")
+            logger.error("SSH tunnel startup timed out after 20 seconds")
             return False
 
         if not tunnel_result["success"]:
             if tunnel_result["error"]:
                 logger.error(f"SSH tunnel failed: {tunnel_result['error']}")
             return False
+        return True
+
+    def connect_db(self) -> bool:
+        """Connect to MySQL database through the persistent SSH tunnel."""
+        # Lock-free fast path: the attribute is only ever swapped whole, so a
+        # single read gives a consistent reference to ping
+        conn = self.connection
+        if conn:
+            try:
+                conn.ping(reconnect=True)
+                return True
+            except Exception:
+                with self._lock:
+                    # Another thread may already have replaced it
+                    if self.connection is conn:
+                        self.connection = None
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        # The tunnel is normally pre-warmed at startup; only a cold or dropped
+        # tunnel pays for the threaded start below
+        tunnel_up = self.tunnel is not None and getattr(self.tunnel, "is_active", False)
+        if not tunnel_up and not self._start_tunnel_with_timeout():
+            return False
 
         host = self._local_bind_host or "127.0.0.1"
         port = int(self._local_bind_port or self.db_port)
 
         # Quick reachability probe (not under the lock)
         try:
-            import socket
-
             s = socket.create_connection((host, port), timeout=3.0)
             s.close()
         except Exception as e:
@@ -234,21 +388,28 @@ class DatabaseService:
                 write_timeout=20,
                 autocommit=True,
             )
+            _enable_keepalive(conn)
         except Exception as e:
             logger.error(f"Failed to connect to MySQL at {host}:{port}: {e}")
             return False
 
-        # Cache under lock
+        # Cache under lock, keeping a connection another thread set meanwhile
         with self._lock:
-            self.connection = conn
-            logger.info("Connected to MySQL through SSH tunnel")
-            return True
+            if self.connection is None:
+                self.connection = conn
+                logger.info("Connected to MySQL through SSH tunnel")
+                return True
+        try:
+            conn.close()
+        except Exception:
+            pass
+        return True
 
     def _new_conn(self):
         """Create a new MySQL connection. Assumes tunnel is already up."""
         host = self._local_bind_host or "127.0.0.1"
         port = int(self._local_bind_port or self.db_port)
-        return pymysql.connect(
+        conn = pymysql.connect(
             host=host,
             port=port,
             user=self.db_user,
@@ -261,6 +422,33 @@ class DatabaseService:
             write_timeout=10,
             autocommit=True,
         )
+        _enable_keepalive(conn)
+        return conn
+
+    def _reset_pool(self) -> None:
+        """Replace the connection pool; call with ``self._lock`` held."""
+        if self._pool is not None:
+            self._pool.close()
+        self._pool = ConnectionPool(
+            self._new_conn, max_idle=self.pool_size, lifetime=self.pool_lifetime
+        )
+
+    def _supports_window_functions(self, conn) -> bool:
+        """True if the server has ROW_NUMBER() (MySQL 8+ / MariaDB 10.2+)."""
+        if self._window_functions is None:
+            try:
+                info = conn.get_server_info()
+                # MariaDB reports e.g. "5.5.5-10.6.12-MariaDB" for old clients
+                version = info[len("5.5.5-") :] if info.startswith("5.5.5-") else info
+                major, minor = (int(x) for x in version.split("-")[0].split(".")[:2])
+                if "mariadb" in info.lower():
+                    self._window_functions = (major, minor) >= (10, 2)
+                else:
+                    self._window_functions = major >= 8
+            except Exception as e:
+                logger.warning(f"Could not parse MySQL server version: {e}")
+                self._window_functions = False
+        return self._window_functions
 
     def get_reference_pans_for_restaurant(
         self,
@@ -269,133 +457,119 @@ class DatabaseService:
         types: List[int] | None = None,
         days_back: int = 0,
         hard_limit: int = 5000,
+        pan_ids: Iterable[int | str] | None = None,
     ) -> List[Dict]:
         """
         Return the latest scan row per PanID for a restaurant directly from the DB.
         - If 'types' is provided, restrict to those Type values (e.g., [6] for reference pans).
+        - If 'pan_ids' is provided, only rows for those PanIDs are read.
         - If 'date' is provided, limit the time window around that day (optionally 'days_back' days before).
+        Results are cached for a minute per argument set; failures are not cached.
         """
+        if pan_ids is not None:
+            pan_ids = list(pan_ids)
+        cache_key = (
+            str(restaurant_id),
+            date or "",
+            tuple(sorted(types or ())),
+            int(days_back),
+            int(hard_limit),
+            None if pan_ids is None else tuple(sorted(str(p) for p in pan_ids)),
+        )
+        cached = self._pan_cache.get(cache_key)
+        if cached is not None:
+            # Fresh row dicts, so a caller editing its rows cannot touch the cache
+            return [dict(row) for row in cached]
         try:
             if not self.start_tunnel():
                 return []
 
-            conn = None
-            cursor = None
-            try:
-                conn = self._new_conn()
-                conn.ping(reconnect=True)
-                cursor = conn.cursor()
-
-                where = ["s.RestaurantID = %s", "s.PanID IS NOT NULL", "s.Status <> 0"]
-                params: list = [restaurant_id]
-                if types and len(types) > 0:
-                    placeholders = ",".join(["%s"] * len(types))
-                    where.append(f"s.Type IN ({placeholders})")
-                    params.extend(types)
-                # Time window filter using COALESCE of known timestamp columns
-                if date:
-                    try:
-                        from datetime import datetime, timedelta
-
-                        # Interpret date as UTC midnight
-                        base = datetime.strptime(date, "%Y-%m-%d")
-                        start = base - timedelta(days=max(0, int(days_back)))
-                        end = base + timedelta(days=1)  # up to end of that date
-                        where.append(
-                            "COALESCE(s.UpdatedAt, s.CapturedAt, s.CreatedAt) >= %s"
-                        )
-                        where.append(
-                            "COALESCE(s.UpdatedAt, s.CapturedAt, s.CreatedAt) < %s"
-                        )
-                        params.append(start.strftime("%Y-%m-%d %H:%M:%S"))
-                        params.append(end.strftime("%Y-%m-%d %H:%M:%S"))
-                    except Exception as te:
-                        logger.warning(
-                            f"Time window parse failed for date={date}: {te}"
-                        )
-                where_sql = " AND ".join(where)
-                query = (
-                    "SELECT s.ID, s.Number, s.ShortID, s.PanID, s.MenuItemName, s.DetectedSizeStandard, "
-                    "s.Weight, s.DetectedDepth, s.Volume, s.ImageURL, s.DepthImageURL, "
-                    "s.Status, s.Type, s.CapturedAt, s.CreatedAt, s.UpdatedAt, "
-                    "COALESCE(p.Shape, 'Unknown') as Shape, "
-                    "COALESCE(p.SizeStandard, s.DetectedSizeStandard) as SizeStandard, "
-                    "p.Data AS PansData, p.Depth AS PanDepth "
-                    "FROM Scans s "
-                    "LEFT JOIN Pans p ON s.PanID = p.ID "
-                    f"WHERE {where_sql} "
-                    "ORDER BY s.PanID ASC, s.UpdatedAt DESC, s.CapturedAt DESC, s.CreatedAt DESC "
-                    "LIMIT %s"
+            params: list = [restaurant_id]
+            if types:
+                params.extend(types)
+            if pan_ids is not None:
+                if not pan_ids:
+                    return []
+                params.extend(pan_ids)
+            # Time window filter using COALESCE of known timestamp columns
+            with_date = False
+            if date:
+                try:
+                    # Interpret date as UTC midnight
+                    base = datetime.strptime(date, "%Y-%m-%d")
+                    start = base - timedelta(days=max(0, int(days_back)))
+                    end = base + timedelta(days=1)  # up to end of that date
+                    params.append(start.strftime("%Y-%m-%d %H:%M:%S"))
+                    params.append(end.strftime("%Y-%m-%d %H:%M:%S"))
+                    with_date = True
+                except Exception as te:
+                    logger.warning(f"Time window parse failed for date={date}: {te}")
+
+            pool = self._pool
+            # Unbuffered cursor: rows are cleaned as they stream in instead of
+            # after the whole result set has been buffered by the driver
+            with pool.connection() as conn, conn.cursor(
+                pymysql.cursors.SSDictCursor
+            ) as cursor:
+                window = self._supports_window_functions(conn)
+                query = _reference_pans_query(
+                    len(types or ()),
+                    0 if pan_ids is None else len(pan_ids),
+                    with_date,
+                    window,
                 )
+                if not window:
+                    # The 5.7 query repeats the filter in its subquery
+                    params = params + params
                 params.append(int(hard_limit))
 
                 cursor.execute(query, tuple(params))
-                rows = cursor.fetchall() or []
-
-                # Debug: Log the first result to see what fields we're getting
-                if rows:
-                    logger.info(f"First result fields: {list(rows[0].keys())}")
-                    logger.info(f"First result Shape field: {rows[0].get('Shape')}")
-                    logger.info(
-                        f"First result SizeStandard field: {rows[0].get('SizeStandard')}"
-                    )
 
-                seen: set[int] = set()
-                latest: List[Dict] = []
-                for row in rows:
-                    pid = row.get("PanID")
-                    if pid is None or pid in seen:
-                        continue
-                    seen.add(pid)
-                    # Parse Pans.Data JSON if present
-                    if "PansData" in row and isinstance(row["PansData"], str):
+                # Both query variants already return one row per pan
+                by_pan: Dict[int, Dict] = {}
+                loads = orjson.loads
+                float_keys = _FLOAT_NULL_KEYS
+                row_count = 0
+                for row_count, row in enumerate(cursor, 1):
+                    if row_count == 1:
+                        # Debug: Log the first result to see what fields we're getting
+                        logger.info(f"First result fields: {list(row.keys())}")
+                        logger.info(f"First result Shape field: {row.get('Shape')}")
+                        logger.info(
+                            f"First result SizeStandard field: {row.get('SizeStandard')}"
+                        )
+                    pid = row["PanID"]
+                    # Parse Pans.Data JSON (the driver may hand back str or
+                    # bytes, or an already-decoded value); the raw column is
+                    # dropped since only the parsed Data is used downstream
+                    pans_data = row.pop("PansData", None)
+                    if not pans_data:
+                        row["Data"] = {}
+                    elif isinstance(pans_data, (str, bytes)):
                         try:
-                            import json as _json
-
-                            row["Data"] = _json.loads(row["PansData"])
-                        except Exception:
+                            row["Data"] = loads(pans_data)
+                        except orjson.JSONDecodeError:
                             row["Data"] = {}
+                    else:
+                        row["Data"] = pans_data
                     # Normalize depth field from Pans if available
-                    if "PanDepth" in row and row.get("PanDepth") is not None:
-                        row["Depth"] = float(row["PanDepth"])
+                    pan_depth = row.get("PanDepth")
+                    if pan_depth is not None:
+                        row["Depth"] = float(pan_depth)
 
-                    # Convert NULL values to appropriate defaults for React
-                    cleaned_row = {}
+                    # Convert NULL values to appropriate defaults for React, in
+                    # place (only values change, so iterating is safe)
                     for key, value in row.items():
                         if value is None:
-                            if key in [
-                                "Number",
-                                "ShortID",
-                                "MenuItemName",
-                                "DetectedSizeStandard",
-                                "Shape",
-                                "SizeStandard",
-                            ]:
-                                cleaned_row[key] = ""
-                            elif key in ["Weight", "DetectedDepth", "Volume"]:
-                                cleaned_row[key] = 0.0
-                            else:
-                                cleaned_row[key] = ""
-                        else:
-                            cleaned_row[key] = value
-                    latest.append(cleaned_row)
+                            row[key] = 0.0 if key in float_keys else ""
+                    by_pan[pid] = row
+                latest: List[Dict] = list(by_pan.values())
 
                 logger.info(
-                    f"DB pans: selected {len(latest)} unique pans from {len(rows)} rows (restaurant_id={restaurant_id}, types={types}, date={date}, days_back={days_back})"
+                    f"DB pans: selected {len(latest)} unique pans from {row_count} rows (restaurant_id={restaurant_id}, types={types}, date={date}, days_back={days_back})"
                 )
-                return latest
-
-            finally:
-                try:
-                    if cursor:
-                        cursor.close()
-                except Exception:
-                    pass
-                try:
-                    if conn:
-                        conn.close()
-                except Exception:
-                    pass
+                self._pan_cache.set(cache_key, latest)
+                return [dict(row) for row in latest]
         except Exception as e:
             logger.error(
                 f"Failed to get reference pans for restaurant {restaurant_id}: {e}"
@@ -406,15 +580,35 @@ class DatabaseService:
         """
         Single pan query (kept for backward compatibility)
         """
-        # Use the main method instead of the batch method
-        all_pans = self.get_reference_pans_for_restaurant(restaurant_id, types=[6])
-        for pan in all_pans:
-            if pan.get("PanID") == pan_id:
-                return [pan]
-        return []
+        # Use the main method instead of the batch method, indexing its
+        # (cached) result once so repeated lookups skip the linear scan
+        key = str(restaurant_id)
+        by_pan = self._pan_index.get(key)
+        if by_pan is None:
+            all_pans = self.get_reference_pans_for_restaurant(restaurant_id, types=[6])
+            by_pan = {}
+            for pan in all_pans:
+                by_pan.setdefault(pan.get("PanID"), pan)
+            if all_pans:
+                self._pan_index.set(key, by_pan)
+        pan = by_pan.get(pan_id)
+        return [dict(pan)] if pan is not None else []
+
+    def clear_reference_cache(self, restaurant_id: int | str | None = None) -> int:
+        """Drop cached reference pans for one restaurant (or all); returns count."""
+        if restaurant_id is None:
+            dropped = len(self._pan_cache) + len(self._pan_index)
+            self._pan_cache.clear()
+            self._pan_index.clear()
+            return dropped
+        rid = str(restaurant_id)
+        dropped = self._pan_cache.evict(lambda k: k[0] == rid)
+        return dropped + self._pan_index.evict(lambda k: k == rid)
 
     def close(self):
-        """Close database connection and SSH tunnel"""
+        """Close database connections and SSH tunnel"""
+        if self._pool is not None:
+            self._pool.close()
         try:
             if self.connection:
                 self.connection.close()
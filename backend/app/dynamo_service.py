@@ -1,11 +1,43 @@
 import logging
 import uuid
 from boto3.dynamodb.conditions import Attr, Key
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.utils.config import get_config
-from app.utils.dynamo_client import get_dynamodb
+from app.utils.dynamo_client import get_dynamodb, get_table_status
+from app.utils.ttl_cache import TTLCache
+
+# DynamoDB cap on writes per TransactWriteItems call used for batched updates
+_TRANSACT_MAX_ITEMS = 100
+
+# Attempts for a version-checked audit session update before giving up
+_SESSION_UPDATE_ATTEMPTS = 3
+
+# Scans per "restaurant#date" partition, shared across service instances so
+# UI polling does not query the table on every request. Writes through this
+# service evict their partition; population runs call invalidate_scans_cache.
+_SCANS_CACHE_TTL_SECONDS = 15.0
+_scans_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(
+    maxsize=4096, ttl=_SCANS_CACHE_TTL_SECONDS
+)
+
+
+def _utc_now_iso() -> str:
+    # Same naive-UTC format utcnow() produced, so stored timestamps stay
+    # comparable as strings
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def invalidate_scans_cache(date: str, restaurant_id: Any = None) -> None:
+    """Drop cached scans for a date, or for one restaurant on that date."""
+    if restaurant_id is not None:
+        _scans_cache.pop(f"{restaurant_id}#{date}")
+        return
+    suffix = f"#{date}"
+    _scans_cache.evict(lambda key: str(key).endswith(suffix))
 
 
 class DynamoDBService:
@@ -19,26 +51,166 @@ class DynamoDBService:
             self.dynamo_config.get("table_names")["audit_session"]
         )
         self.users_table = self.db.Table(self.dynamo_config.get("table_names")["users"])
+        # Optional GSI on audit sessions: restaurantId (HASH) + date (RANGE).
+        # Without it the session lookups below fall back to table scans.
+        indexes = self.dynamo_config.get("indexes") or {}
+        self.session_restaurant_index = (
+            indexes.get("audit_session_restaurant_date") or None
+        )
+        # Optional GSI on scan audits whose HASH key is the scan's day
+        # (YYYY-MM-DD, the date half of RestaurantDate). Without it there is
+        # no cheap whole-day read and callers query per restaurant instead.
+        self.scan_date_index = indexes.get("scan_audit_date") or None
+        self.scan_date_key = indexes.get("scan_audit_date_key") or "date"
         self.logger = logging.getLogger(__name__)
 
     def test_connection(self, table_name):
         try:
             table_attr_name = f"{table_name}_table"
             table = getattr(self, table_attr_name)
-            return f"Table '{table.name}' is {self.audit_session_table.table_status}"
+            return f"Table '{table.name}' is {get_table_status(table.name)}"
         except Exception as e:
             return f"Connection failed: {str(e)}"
 
-    def get_scans_by_restaurant_day(self, restaurantID, date):
+    def get_scans_by_restaurant_day(
+        self, restaurantID, date, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a restaurant's scans for a day, following query pagination
+
+        Args:
+            restaurantID: Restaurant ID
+            date: Date of the scans (YYYY-MM-DD)
+            limit: Stop reading once this many scans have been fetched
+
+        Returns:
+            List of scan records (at most ``limit``)
+        """
         partition_key = f"{restaurantID}#{date}"
+        cached = _scans_cache.get(partition_key)
+        if cached is not None:
+            return cached if limit is None else cached[:limit]
         try:
-            response = self.scan_audit_table.query(
-                KeyConditionExpression=Key("RestaurantDate").eq(partition_key)
-            )
+            items: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {
+                "KeyConditionExpression": Key("RestaurantDate").eq(partition_key)
+            }
+            while True:
+                if limit is not None:
+                    kwargs["Limit"] = limit - len(items)
+                response = self.scan_audit_table.query(**kwargs)
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    # Whole partition read; safe to serve later calls from cache
+                    _scans_cache.set(partition_key, items)
+                    break
+                if limit is not None and len(items) >= limit:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return items
+        except Exception as e:
+            # Retries/backoff already happened in the client; let callers decide
+            self.logger.error(f"Failed to query records for {partition_key}: {e}")
+            raise
 
-            return response.get("Items", [])
+    def count_scans_by_restaurant_day(self, restaurantID, date) -> int:
+        """
+        Count a restaurant's scans for a day without fetching the records
+
+        Args:
+            restaurantID: Restaurant ID
+            date: Date of the scans (YYYY-MM-DD)
+
+        Returns:
+            Number of scans in the partition
+        """
+        partition_key = f"{restaurantID}#{date}"
+        cached = _scans_cache.get(partition_key)
+        if cached is not None:
+            return len(cached)
+        try:
+            total = 0
+            kwargs: Dict[str, Any] = {
+                "KeyConditionExpression": Key("RestaurantDate").eq(partition_key),
+                "Select": "COUNT",
+            }
+            while True:
+                response = self.scan_audit_table.query(**kwargs)
+                total += response.get("Count", 0)
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return total
         except Exception as e:
-            return f"Failed to query records: {str(e)}"
+            self.logger.error(f"Failed to count records for {partition_key}: {e}")
+            raise
+
+    def get_scan_audit_fields(self, restaurantID, date) -> List[Dict[str, Any]]:
+        """
+        Get only the audit status fields of a restaurant's scans for a day
+
+        Args:
+            restaurantID: Restaurant ID
+            date: Date of the scans (YYYY-MM-DD)
+
+        Returns:
+            One {"isAudited", "auditStatus"} dict per scan (missing keys omitted)
+        """
+        partition_key = f"{restaurantID}#{date}"
+        try:
+            items: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {
+                "KeyConditionExpression": Key("RestaurantDate").eq(partition_key),
+                "ProjectionExpression": "isAudited, auditStatus",
+            }
+            while True:
+                response = self.scan_audit_table.query(**kwargs)
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return items
+        except Exception as e:
+            self.logger.error(f"Failed to query audit fields for {partition_key}: {e}")
+            raise
+
+    def get_scans_by_day(self, date: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get scans for every restaurant on a date from the date GSI
+
+        Args:
+            date: Date of the scans (YYYY-MM-DD)
+
+        Returns:
+            List of scan records, or None if no date index is configured or
+            the query failed (callers then query per restaurant; the table is
+            never scanned here)
+        """
+        if not self.scan_date_index:
+            return None
+        try:
+            items: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {
+                "IndexName": self.scan_date_index,
+                "KeyConditionExpression": Key(self.scan_date_key).eq(date),
+            }
+            while True:
+                response = self.scan_audit_table.query(**kwargs)
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return items
+        except Exception as e:
+            self.logger.warning(
+                f"Date index query failed for {date}, "
+                f"falling back to per-restaurant queries: {e}"
+            )
+            return None
 
     def get_all_users(self):
         try:
@@ -71,7 +243,7 @@ class DynamoDBService:
         """
         try:
             session_id = str(uuid.uuid4())
-            current_time = datetime.utcnow().isoformat()
+            current_time = _utc_now_iso()
 
             session_data = {
                 "auditReportId": session_id,  # Primary key
@@ -88,6 +260,7 @@ class DynamoDBService:
                 "actionsCount": 0,
                 "createdAt": current_time,
                 "updatedAt": current_time,
+                "version": 0,  # bumped by every update_audit_session
             }
 
             self.audit_session_table.put_item(Item=session_data)
@@ -122,46 +295,145 @@ class DynamoDBService:
             self.logger.error(f"Failed to get audit session {session_id}: {e}")
             return None
 
-    def update_audit_session(self, session_id: str, updates: Dict[str, Any]) -> bool:
+    def claim_audit_session(
+        self, session_id: str, expected_version: int
+    ) -> Optional[int]:
+        """
+        Atomically move an in-progress session to ``applying``
+
+        Only one caller can claim a session: the write is conditional on the
+        session still being in progress at the version the caller read.
+
+        Args:
+            session_id: Session ID to claim
+            expected_version: Session version the caller read
+
+        Returns:
+            The session's new version if the claim succeeded, None if the
+            session was claimed or changed by someone else
+        """
+        try:
+            response = self.audit_session_table.update_item(
+                Key={"auditReportId": session_id, "tsEventType": "audit_session"},
+                UpdateExpression=(
+                    "SET #status = :applying, #updatedAt = :now, "
+                    "#version = if_not_exists(#version, :zero) + :one"
+                ),
+                ConditionExpression=(
+                    "#status = :in_progress AND "
+                    "(attribute_not_exists(#version) OR #version = :expected)"
+                ),
+                ExpressionAttributeNames={
+                    "#status": "status",
+                    "#updatedAt": "updatedAt",
+                    "#version": "version",
+                },
+                ExpressionAttributeValues={
+                    ":applying": "applying",
+                    ":in_progress": "in_progress",
+                    ":now": _utc_now_iso(),
+                    ":zero": 0,
+                    ":one": 1,
+                    ":expected": int(expected_version),
+                },
+                ReturnValues="UPDATED_NEW",
+            )
+            return int(response.get("Attributes", {}).get("version", 0))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == (
+                "ConditionalCheckFailedException"
+            ):
+                self.logger.warning(
+                    f"Audit session {session_id} is not claimable (already "
+                    f"applying, finished or changed concurrently)"
+                )
+                return None
+            raise
+
+    def update_audit_session(
+        self,
+        session_id: str,
+        updates: Dict[str, Any],
+        expected_version: Optional[int] = None,
+        retry_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> bool:
         """
         Update audit session with new data
 
+        Every update bumps the session's ``version``. When ``expected_version``
+        is given the write only succeeds if nobody updated the session since
+        that version was read. On a conflict the session is re-read and the
+        write retried against the new version, as long as ``retry_if`` (if
+        given) still accepts the fresh session.
+
         Args:
             session_id: Session ID to update
             updates: Dictionary of fields to update
+            expected_version: Session version the caller based the update on
+            retry_if: Predicate on the re-read session deciding whether to retry
 
         Returns:
             True if successful, False otherwise
         """
         try:
             # Add updated timestamp
-            updates["updatedAt"] = datetime.utcnow().isoformat()
+            updates["updatedAt"] = _utc_now_iso()
 
             # Build update expression
-            update_expression = "SET "
-            expression_values = {}
-            expression_names = {}
-
-            for key, value in updates.items():
-                attr_name = f"#{key}"
-                attr_value = f":{key}"
-
-                update_expression += f"{attr_name} = {attr_value}, "
-                expression_names[attr_name] = key
-                expression_values[attr_value] = value
-
-            # Remove trailing comma and space
-            update_expression = update_expression.rstrip(", ")
+            assignments = [f"#{key} = :{key}" for key in updates]
+            expression_names = {f"#{key}": key for key in updates}
+            expression_values = {f":{key}": value for key, value in updates.items()}
+
+            # Sessions created before versioning start counting from 0
+            assignments.append("#version = if_not_exists(#version, :zero) + :one")
+            update_expression = "SET " + ", ".join(assignments)
+            expression_names["#version"] = "version"
+            expression_values[":zero"] = 0
+            expression_values[":one"] = 1
+
+            key = {"auditReportId": session_id, "tsEventType": "audit_session"}
+            if expected_version is None:
+                self.audit_session_table.update_item(
+                    Key=key,
+                    UpdateExpression=update_expression,
+                    ExpressionAttributeNames=expression_names,
+                    ExpressionAttributeValues=expression_values,
+                )
+                self.logger.info(f"Updated audit session {session_id}")
+                return True
+
+            version = int(expected_version)
+            for attempt in range(1, _SESSION_UPDATE_ATTEMPTS + 1):
+                expression_values[":expected"] = version
+                try:
+                    self.audit_session_table.update_item(
+                        Key=key,
+                        UpdateExpression=update_expression,
+                        ConditionExpression=(
+                            "attribute_not_exists(#version) OR #version = :expected"
+                        ),
+                        ExpressionAttributeNames=expression_names,
+                        ExpressionAttributeValues=expression_values,
+                    )
+                    self.logger.info(f"Updated audit session {session_id}")
+                    return True
+                except ClientError as e:
+                    code = e.response.get("Error", {}).get("Code")
+                    if code != "ConditionalCheckFailedException":
+                        raise
+                current = self.get_audit_session(session_id)
+                if not current or (retry_if is not None and not retry_if(current)):
+                    break
+                version = int(current.get("version", 0))
+                self.logger.warning(
+                    f"Audit session {session_id} changed concurrently "
+                    f"(attempt {attempt}), retrying at version {version}"
+                )
 
-            self.audit_session_table.update_item(
-                Key={"auditReportId": session_id, "tsEventType": "audit_session"},
-                UpdateExpression=update_expression,
-                ExpressionAttributeNames=expression_names,
-                ExpressionAttributeValues=expression_values,
+            self.logger.warning(
+                f"Gave up updating audit session {session_id}: concurrent update"
             )
-
-            self.logger.info(f"Updated audit session {session_id}")
-            return True
+            return False
 
         except Exception as e:
             self.logger.error(f"Failed to update audit session {session_id}: {e}")
@@ -181,7 +453,7 @@ class DynamoDBService:
         try:
             updates = {
                 "status": "completed",
-                "endTime": datetime.utcnow().isoformat(),
+                "endTime": _utc_now_iso(),
                 "actionsCount": final_actions_count,
             }
 
@@ -191,6 +463,55 @@ class DynamoDBService:
             self.logger.error(f"Failed to complete audit session {session_id}: {e}")
             return False
 
+    def _query_sessions_index(
+        self,
+        restaurant_id: int,
+        date: Optional[str] = None,
+        active_only: bool = False,
+        limit: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read a restaurant's sessions from the restaurantId/date GSI
+
+        Args:
+            restaurant_id: Restaurant ID
+            date: Restrict to sessions for this date (YYYY-MM-DD)
+            active_only: Only return in-progress sessions
+            limit: Stop once this many sessions have been read (newest first)
+
+        Returns:
+            Matching sessions, or None if no index is configured or the query
+            failed (callers then fall back to a scan)
+        """
+        if not self.session_restaurant_index:
+            return None
+        key_condition = Key("restaurantId").eq(restaurant_id)
+        if date:
+            key_condition = key_condition & Key("date").eq(date)
+        kwargs: Dict[str, Any] = {
+            "IndexName": self.session_restaurant_index,
+            "KeyConditionExpression": key_condition,
+            "ScanIndexForward": False,
+        }
+        if active_only:
+            kwargs["FilterExpression"] = Attr("status").eq("in_progress")
+        try:
+            items: List[Dict[str, Any]] = []
+            while True:
+                response = self.audit_session_table.query(**kwargs)
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key or (limit is not None and len(items) >= limit):
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return items if limit is None else items[:limit]
+        except Exception as e:
+            self.logger.warning(
+                f"Session index query failed for restaurant {restaurant_id}, "
+                f"falling back to a scan: {e}"
+            )
+            return None
+
     def get_audit_sessions_by_restaurant(
         self, restaurant_id: int, limit: int = 50
     ) -> List[Dict[str, Any]]:
@@ -204,9 +525,11 @@ class DynamoDBService:
         Returns:
             List of audit sessions
         """
+        indexed = self._query_sessions_index(restaurant_id, limit=limit)
+        if indexed is not None:
+            return indexed
         try:
-            # For now, scan the table and filter by restaurant_id
-            # In production, you should create a GSI on restaurantId
+            # No GSI configured: scan the table and filter by restaurant_id
             response = self.audit_session_table.scan(
                 FilterExpression=Attr("restaurantId").eq(restaurant_id), Limit=limit
             )
@@ -219,13 +542,56 @@ class DynamoDBService:
             )
             return []
 
+    def get_audit_sessions_for_date(
+        self, restaurant_id: int, date: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Get audit sessions for a restaurant on a specific date
+
+        Args:
+            restaurant_id: Restaurant ID
+            date: Date being audited (YYYY-MM-DD)
+
+        Returns:
+            List of audit sessions
+        """
+        indexed = self._query_sessions_index(restaurant_id, date=date)
+        if indexed is not None:
+            return indexed
+        try:
+            # No GSI configured: filter server-side so only matching sessions
+            # come back over the wire
+            items: List[Dict[str, Any]] = []
+            kwargs: Dict[str, Any] = {
+                "FilterExpression": (
+                    Attr("restaurantId").eq(restaurant_id) & Attr("date").eq(date)
+                )
+            }
+            while True:
+                response = self.audit_session_table.scan(**kwargs)
+                items.extend(response.get("Items", []))
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return items
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to get audit sessions for restaurant {restaurant_id} on {date}: {e}"
+            )
+            return []
+
     def get_active_sessions_for_date(
         self, restaurant_id: int, date: str
     ) -> List[Dict[str, Any]]:
         """
         Return in-progress sessions for a restaurant on a given date.
-        Note: Uses a scan; consider adding a GSI for production scale.
+        Note: Uses a scan unless the restaurantId/date GSI is configured.
         """
+        indexed = self._query_sessions_index(restaurant_id, date=date, active_only=True)
+        if indexed is not None:
+            return indexed
         try:
             response = self.audit_session_table.scan(
                 FilterExpression=(
@@ -241,6 +607,38 @@ class DynamoDBService:
             )
             return []
 
+    def get_active_sessions_by_date(self, date: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get in-progress sessions for every restaurant on a date in one
+        paginated scan
+
+        Args:
+            date: Date being audited (YYYY-MM-DD)
+
+        Returns:
+            Sessions grouped by restaurant ID (as a string)
+        """
+        sessions: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            kwargs: Dict[str, Any] = {
+                "FilterExpression": (
+                    Attr("date").eq(date) & Attr("status").eq("in_progress")
+                )
+            }
+            while True:
+                response = self.audit_session_table.scan(**kwargs)
+                for item in response.get("Items", []):
+                    rid = str(item.get("restaurantId"))
+                    sessions.setdefault(rid, []).append(item)
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return sessions
+        except Exception as e:
+            self.logger.error(f"Failed to get active sessions for {date}: {e}")
+            return {}
+
     def update_scan_audit_status(
         self, restaurant_id: int, date: str, scan_id: str, audit_data: Dict[str, Any]
     ) -> bool:
@@ -258,7 +656,7 @@ class DynamoDBService:
         """
         try:
             partition_key = f"{restaurant_id}#{date}"
-            current_time = datetime.utcnow().isoformat()
+            current_time = _utc_now_iso()
 
             # Add audit tracking fields
             audit_data.update(
@@ -270,20 +668,13 @@ class DynamoDBService:
             )
 
             # Build update expression
-            update_expression = "SET "
-            expression_values = {}
-            expression_names = {}
-
-            for key, value in audit_data.items():
-                attr_name = f"#{key}"
-                attr_value = f":{key}"
-
-                update_expression += f"{attr_name} = {attr_value}, "
-                expression_names[attr_name] = key
-                expression_values[attr_value] = value
-
-            # Remove trailing comma and space
-            update_expression = update_expression.rstrip(", ")
+            update_expression = "SET " + ", ".join(
+                f"#{key} = :{key}" for key in audit_data
+            )
+            expression_names = {f"#{key}": key for key in audit_data}
+            expression_values = {
+                f":{key}": value for key, value in audit_data.items()
+            }
 
             self.scan_audit_table.update_item(
                 Key={"RestaurantDate": partition_key, "scanId": scan_id},
@@ -291,6 +682,7 @@ class DynamoDBService:
                 ExpressionAttributeNames=expression_names,
                 ExpressionAttributeValues=expression_values,
             )
+            _scans_cache.pop(partition_key)
 
             self.logger.info(f"Updated audit status for scan {scan_id}")
             return True
@@ -299,18 +691,113 @@ class DynamoDBService:
             self.logger.error(f"Failed to update scan audit status for {scan_id}: {e}")
             return False
 
-    def get_audit_progress(self, session_id: str) -> Dict[str, Any]:
+    def batch_update_scan_audit_status(
+        self,
+        restaurant_id: int,
+        date: str,
+        updates: List[Tuple[str, Dict[str, Any]]],
+    ) -> int:
+        """
+        Update scan audit status for many scans with TransactWriteItems
+
+        Args:
+            restaurant_id: Restaurant ID
+            date: Date of the scans
+            updates: (scan_id, audit_data) pairs, applied in order
+
+        Returns:
+            Number of scans updated
+        """
+        partition_key = f"{restaurant_id}#{date}"
+        current_time = _utc_now_iso()
+        serializer = TypeSerializer()
+        client = self.db.meta.client
+
+        # A transaction holds at most 100 writes and may touch an item only
+        # once, so a repeated scan ID starts the next one (keeping order)
+        chunks: List[List[Tuple[str, Dict[str, Any]]]] = []
+        chunk: List[Tuple[str, Dict[str, Any]]] = []
+        chunk_ids: set = set()
+        for scan_id, audit_data in updates:
+            if len(chunk) == _TRANSACT_MAX_ITEMS or scan_id in chunk_ids:
+                chunks.append(chunk)
+                chunk = []
+                chunk_ids = set()
+            chunk.append((scan_id, audit_data))
+            chunk_ids.add(scan_id)
+        if chunk:
+            chunks.append(chunk)
+
+        updated = 0
+        for chunk in chunks:
+            transact_items = []
+            for scan_id, audit_data in chunk:
+                audit_data.update(
+                    {
+                        "isAudited": "true",
+                        "auditedAt": current_time,
+                        "updatedAt": current_time,
+                    }
+                )
+                update_expression = "SET " + ", ".join(
+                    f"#{key} = :{key}" for key in audit_data
+                )
+                transact_items.append(
+                    {
+                        "Update": {
+                            "TableName": self.scan_audit_table.name,
+                            "Key": {
+                                "RestaurantDate": {"S": partition_key},
+                                "scanId": {"S": str(scan_id)},
+                            },
+                            "UpdateExpression": update_expression,
+                            "ExpressionAttributeNames": {
+                                f"#{key}": key for key in audit_data
+                            },
+                            "ExpressionAttributeValues": {
+                                f":{key}": serializer.serialize(value)
+                                for key, value in audit_data.items()
+                            },
+                        }
+                    }
+                )
+            try:
+                client.transact_write_items(TransactItems=transact_items)
+                updated += len(chunk)
+            except Exception as e:
+                # One bad write cancels the whole transaction; fall back to
+                # per-scan updates so the rest still land
+                self.logger.warning(
+                    f"Batch audit update failed for {partition_key}, "
+                    f"retrying {len(chunk)} scans individually: {e}"
+                )
+                for scan_id, audit_data in chunk:
+                    if self.update_scan_audit_status(
+                        restaurant_id, date, scan_id, audit_data
+                    ):
+                        updated += 1
+
+        _scans_cache.pop(partition_key)
+        self.logger.info(f"Updated audit status for {updated} scans in {partition_key}")
+        return updated
+
+    def get_audit_progress(
+        self, session_id: str, session: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Get audit progress for a session
 
         Args:
             session_id: Session ID
+            session: The session item if the caller already read it; saves a
+                second GetItem round trip
 
         Returns:
             Progress data including counts and percentages
         """
         try:
-            session = self.get_audit_session(session_id)
+            if session is None:
+                session = self.get_audit_session(session_id)
             if not session:
                 return {"error": "Session not found"}
 
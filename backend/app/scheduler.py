@@ -14,7 +14,7 @@ from boto3.dynamodb.conditions import Attr
 from datetime import datetime
 from pathlib import Path
 from pytz import timezone
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 from app.utils.config import get_config
 from app.utils.dynamo_client import get_dynamodb
@@ -28,9 +28,11 @@ _date_propagation_state: Dict[str, Dict[str, bool]] = (
 )  # {date: {running: bool, noData: bool}}
 _ai_state: Dict[str, Dict[str, object]] = (
     {}
-)  # {date: {running: bool, completedAt: str|None, lastError: str|None}}
+)  # {date: {running, completedAt, lastError, coverage, coverageAt}}
 _scheduler: Optional[AsyncIOScheduler] = None
 _last_ui_trigger_ts: float = 0.0
+_state_listeners: List[Callable[[str], None]] = []
+_run_finished_listeners: List[Callable[[str], None]] = []
 
 
 def _ensure_repo_root_on_path() -> Path:
@@ -53,6 +55,42 @@ async def populate_today_audits() -> None:
     await populate_audits_for_date(None)
 
 
+def add_state_listener(listener: Callable[[str], None]) -> None:
+    """Register a callback that receives the date whenever its state changes.
+
+    Fired for both propagation and AI state updates.
+    """
+    if listener not in _state_listeners:
+        _state_listeners.append(listener)
+
+
+def add_run_finished_listener(listener: Callable[[str], None]) -> None:
+    """Register a callback that receives the date when a run for it ends.
+
+    Fired only when a propagation or AI run goes from running to stopped,
+    i.e. after the day's scans may have been rewritten; coverage-only and
+    no-op state updates do not trigger it.
+    """
+    if listener not in _run_finished_listeners:
+        _run_finished_listeners.append(listener)
+
+
+def _notify(listeners: List[Callable[[str], None]], date_str: str | None) -> None:
+    if not date_str:
+        return
+    for listener in list(listeners):
+        try:
+            listener(date_str)
+        except Exception as e:
+            logger.warning(f"State listener failed for {date_str}: {e}")
+
+
+def _notify_state_change(date_str: str | None, run_finished: bool = False) -> None:
+    _notify(_state_listeners, date_str)
+    if run_finished:
+        _notify(_run_finished_listeners, date_str)
+
+
 def get_propagation_state(date_str: str | None) -> Dict[str, bool]:
     key = date_str or "latest"
     return _date_propagation_state.get(key, {"running": False, "noData": False})
@@ -63,11 +101,13 @@ def set_propagation_state(
 ) -> None:
     key = date_str or "latest"
     state = _date_propagation_state.get(key, {"running": False, "noData": False})
+    was_running = state["running"]
     if running is not None:
         state["running"] = running
     if noData is not None:
         state["noData"] = noData
     _date_propagation_state[key] = state
+    _notify_state_change(date_str, run_finished=was_running and not state["running"])
 
 
 def get_ai_state(date_str: str) -> Dict[str, object]:
@@ -84,16 +124,25 @@ def get_ai_state(date_str: str) -> Dict[str, object]:
 
 
 def set_ai_state(
-    date_str: str, running: bool = None, completedAt: str = None, lastError: str = None
+    date_str: str,
+    running: bool = None,
+    completedAt: str = None,
+    lastError: str = None,
+    coverage: dict = None,
 ) -> None:
     state = get_ai_state(date_str)
+    was_running = state["running"]
     if running is not None:
         state["running"] = running
     if completedAt is not None:
         state["completedAt"] = completedAt
     if lastError is not None:
         state["lastError"] = lastError
+    if coverage is not None:
+        state["coverage"] = coverage
+        state["coverageAt"] = time.time()
     _ai_state[date_str] = state
+    _notify_state_change(date_str, run_finished=was_running and not state["running"])
 
 
 def _compute_coverage_for_date(date_str: str) -> dict:
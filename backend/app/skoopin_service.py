@@ -1,9 +1,16 @@
 import boto3
 import logging
 import requests
-from typing import Any, Dict, List, Optional
+import threading
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.utils.config import get_config
+from app.utils.ttl_cache import TTLCache
+
+# Refresh the Cognito access token this many seconds before it expires
+_TOKEN_EXPIRY_MARGIN = 120
 
 
 class SkoopinService:
@@ -28,8 +35,28 @@ class SkoopinService:
         # Simple in-process circuit breaker to avoid cascading stalls
         self._cb_fail_count = 0
         self._cb_breaker_until = 0.0
+        self._cb_lock = threading.Lock()
         self._CB_THRESHOLD = 5
         self._CB_COOLDOWN_SECONDS = 60
+        # One pooled session so calls reuse keep-alive connections instead of
+        # paying a TCP/TLS handshake each; sized for the action threads below
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        # id -> name map of restaurants; the list rarely changes
+        self._restaurant_names: TTLCache[Dict[Any, str]] = TTLCache(maxsize=1, ttl=300)
+        # Access token reused until shortly before Cognito expires it
+        self._access_token: TTLCache[str] = TTLCache(maxsize=1, ttl=3600)
+        self._token_lock = threading.Lock()
+        # Threads for applying audit actions on different scans in parallel
+        self._action_executor = ThreadPoolExecutor(
+            max_workers=16, thread_name_prefix="skoopin-actions"
+        )
+
+    def close(self) -> None:
+        self._action_executor.shutdown(wait=False)
+        self.http.close()
 
     def _circuit_open(self) -> bool:
         import time as _t
@@ -39,9 +66,12 @@ class SkoopinService:
     def _record_failure(self):
         import time as _t
 
-        self._cb_fail_count += 1
-        if self._cb_fail_count >= self._CB_THRESHOLD:
-            self._cb_breaker_until = _t.time() + self._CB_COOLDOWN_SECONDS
+        with self._cb_lock:
+            self._cb_fail_count += 1
+            opened = self._cb_fail_count >= self._CB_THRESHOLD
+            if opened:
+                self._cb_breaker_until = _t.time() + self._CB_COOLDOWN_SECONDS
+        if opened:
             try:
                 self.logger.warning(
                     "Circuit breaker opened for SkoopinService external calls"
@@ -50,8 +80,9 @@ class SkoopinService:
                 pass
 
     def _record_success(self):
-        self._cb_fail_count = 0
-        self._cb_breaker_until = 0.0
+        with self._cb_lock:
+            self._cb_fail_count = 0
+            self._cb_breaker_until = 0.0
 
     def refresh_access_token(self):
         try:
@@ -64,20 +95,37 @@ class SkoopinService:
             )
             res = resp.get("AuthenticationResult")
             access_token = res["AccessToken"]
+            self._access_token.set("token", access_token, ttl=res.get("ExpiresIn", 3600))
             return access_token
         except Exception as e:
             self.logger.error(f"Error refreshing access token: {e}")
             raise
 
+    def get_access_token(self) -> str:
+        """
+        Return a cached access token, refreshing it when close to expiry
+
+        Returns:
+            Cognito access token
+        """
+        token = self._access_token.get("token", min_ttl=_TOKEN_EXPIRY_MARGIN)
+        if token is None:
+            # One refresh at a time; concurrent callers reuse its result
+            with self._token_lock:
+                token = self._access_token.get("token", min_ttl=_TOKEN_EXPIRY_MARGIN)
+                if token is None:
+                    token = self.refresh_access_token()
+        return token
+
     def get_venues(self, restaurant_id):
         if self._circuit_open():
             self.logger.warning("Circuit open: get_venues short-circuiting")
             return {}
-        access_token = self.refresh_access_token()
+        access_token = self.get_access_token()
         url = f"{self.serverAddress}/venues?RestaurantID={restaurant_id}"
         authorization_val = "Bearer " + str(access_token)
         try:
-            response = requests.get(
+            response = self.http.get(
                 url,
                 headers={"Authorization": authorization_val, "X-Device-Type": "MiniPC"},
                 timeout=(3, 10),
@@ -97,11 +145,11 @@ class SkoopinService:
         if self._circuit_open():
             self.logger.warning("Circuit open: get_pans short-circuiting")
             return []
-        access_token = self.refresh_access_token()
+        access_token = self.get_access_token()
         url = self.serverAddress + f"/pans/?RestaurantID={resturaunt_id}"
         authorization_val = "Bearer " + str(access_token)
         try:
-            response = requests.get(
+            response = self.http.get(
                 url,
                 headers={"Authorization": authorization_val, "X-Device-Type": "MiniPC"},
                 timeout=(3, 15),
@@ -120,7 +168,7 @@ class SkoopinService:
         if self._circuit_open():
             self.logger.warning("Circuit open: get_pan_onboard_scans short-circuiting")
             return []
-        access_token = self.refresh_access_token()
+        access_token = self.get_access_token()
         url = f"{self.serverAddress}/scans"
         try:
             headers = {
@@ -131,7 +179,7 @@ class SkoopinService:
                 "RestaurantID": restaurantId,
                 "Type": 6,
             }
-            resp = requests.get(url, headers=headers, params=params, timeout=(3, 20))
+            resp = self.http.get(url, headers=headers, params=params, timeout=(3, 20))
             resp.raise_for_status()
             j = resp.json()
             data = j.get("data", [])
@@ -146,11 +194,11 @@ class SkoopinService:
         if self._circuit_open():
             self.logger.warning("Circuit open: get_restaurants short-circuiting")
             return []
-        access_token = self.refresh_access_token()
+        access_token = self.get_access_token()
         url = f"{self.serverAddress}/restaurants"
         authorization_val = "Bearer " + str(access_token)
         try:
-            response = requests.get(
+            response = self.http.get(
                 url,
                 headers={"Authorization": authorization_val, "X-Device-Type": "MiniPC"},
                 timeout=(3, 10),
@@ -172,12 +220,30 @@ class SkoopinService:
             self._record_failure()
             return []
 
+    def get_restaurant_name_map(self) -> Dict[Any, str]:
+        """
+        Return restaurant names keyed by restaurant id, cached for a few minutes
+
+        Returns:
+            Mapping of restaurant id to name
+        """
+        names = self._restaurant_names.get("all")
+        if names is None:
+            names = {r["id"]: r["name"] for r in self.get_restaurants()}
+            # An empty list usually means the call failed; retry next time
+            if names:
+                self._restaurant_names.set("all", names)
+        return names
+
+    def clear_restaurant_cache(self) -> None:
+        self._restaurant_names.clear()
+
     def get_scanned_images(self, RestaurantID, menu_item, StartDate, EndDate):
         if self._circuit_open():
             self.logger.warning("Circuit open: get_scanned_images short-circuiting")
             return []
         url = f"{self.serverAddress}/scans"
-        access_token = self.refresh_access_token()
+        access_token = self.get_access_token()
         try:
             headers = {
                 "Authorization": f"Bearer {access_token}",
@@ -190,7 +256,7 @@ class SkoopinService:
             }
             if menu_item:
                 params["MenuItemID"] = menu_item
-            resp = requests.get(url, headers=headers, params=params, timeout=(3, 20))
+            resp = self.http.get(url, headers=headers, params=params, timeout=(3, 20))
             resp.raise_for_status()
             data = resp.json().get("data", [])
             self._record_success()
@@ -229,7 +295,7 @@ class SkoopinService:
             Dict with success status and response data
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
             url = f"{self.serverAddress}/scans/{scan_id}"
             headers = {"Authorization": f"Bearer {access_token}"}
 
@@ -239,7 +305,7 @@ class SkoopinService:
             self.logger.info(f"Deleting scan {scan_id}")
             self.logger.info(f"URL: {url}")
 
-            response = requests.delete(url, headers=headers, timeout=15)
+            response = self.http.delete(url, headers=headers, timeout=15)
 
             print(f"🔍 Response status: {response.status_code}")
             print(f"🔍 Response text: {response.text}")
@@ -279,7 +345,7 @@ class SkoopinService:
             Dict with success status and response data
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
             url = f"{self.serverAddress}/scans/{scan_id}"
             headers = {"Authorization": f"Bearer {access_token}"}
 
@@ -293,7 +359,7 @@ class SkoopinService:
             self.logger.info(f"URL: {url}")
             self.logger.info(f"Payload: {payload}")
 
-            response = requests.patch(url, json=payload, headers=headers, timeout=15)
+            response = self.http.patch(url, json=payload, headers=headers, timeout=15)
 
             print(f"🔍 Response status: {response.status_code}")
             print(f"🔍 Response text: {response.text}")
@@ -344,7 +410,7 @@ class SkoopinService:
             Dict with success status and response data
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
 
             # First get the menu item details
             menu_item = self.get_menu_item(access_token, menu_item_id)
@@ -364,7 +430,7 @@ class SkoopinService:
             }
 
             payload = {"MenuItemID": menu_item["ID"], "MenuItemName": menu_item["Name"]}
-            response = requests.patch(url, json=payload, headers=headers, timeout=15)
+            response = self.http.patch(url, json=payload, headers=headers, timeout=15)
 
             if response.status_code == 200:
                 self.logger.info(
@@ -410,7 +476,7 @@ class SkoopinService:
             Dict with success status and response data
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
             url = f"{self.serverAddress}/scans/{scan_id}"
             headers = {
                 "Authorization": f"Bearer {access_token}",
@@ -418,7 +484,7 @@ class SkoopinService:
             }
 
             payload = {"VenueID": venue_id}
-            response = requests.patch(url, json=payload, headers=headers, timeout=15)
+            response = self.http.patch(url, json=payload, headers=headers, timeout=15)
 
             if response.status_code == 200:
                 self.logger.info(
@@ -465,7 +531,7 @@ class SkoopinService:
             Dict with success status and response data
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
             url = f"{self.serverAddress}/scans/{scan_id}"
             headers = {
                 "Authorization": f"Bearer {access_token}",
@@ -473,7 +539,7 @@ class SkoopinService:
             }
 
             payload = {"ServicePeriodID": meal_period_id}
-            response = requests.patch(url, json=payload, headers=headers, timeout=15)
+            response = self.http.patch(url, json=payload, headers=headers, timeout=15)
 
             if response.status_code == 200:
                 self.logger.info(
@@ -523,7 +589,7 @@ class SkoopinService:
             url = f"{self.serverAddress}/menuitems/{menu_item_id}"
             headers = {"Authorization": f"Bearer {access_token}"}
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http.get(url, headers=headers, timeout=10)
 
             if response.status_code == 200:
                 return response.json().get("data", {})
@@ -551,7 +617,7 @@ class SkoopinService:
             Scan data or None if not found
         """
         try:
-            access_token = self.refresh_access_token()
+            access_token = self.get_access_token()
             url = f"{self.serverAddress}/scans"
             headers = {"Authorization": f"Bearer {access_token}"}
 
@@ -564,7 +630,7 @@ class SkoopinService:
             self.logger.info(f"URL: {url}")
             self.logger.info(f"Params: {params}")
 
-            response = requests.get(url, headers=headers, params=params, timeout=20)
+            response = self.http.get(url, headers=headers, params=params, timeout=20)
 
             self.logger.info(f"Response status: {response.status_code}")
             self.logger.info(
@@ -602,6 +668,105 @@ class SkoopinService:
             self.logger.error(f"Error getting scan {short_id}: {e}")
             return None
 
+    def _apply_audit_action(
+        self, i: int, action: Dict[str, Any], restaurant_id: Optional[int]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Apply one audit action
+
+        Returns:
+            (action result or None, error entry or None)
+        """
+        scan_id = action.get("scan_id")
+        action_type = action.get("action_type")
+        new_value = action.get("new_value")
+
+        print(
+            f"🔍 Processing action {i+1}: {action_type} for scan {scan_id} with value {new_value}"
+        )
+        self.logger.info(
+            f"Processing action {i+1}: {action_type} for scan {scan_id} with value {new_value}"
+        )
+
+        if not scan_id or not action_type:
+            return None, {"action": action, "error": "Missing scan_id or action_type"}
+
+        # Resolve short scan ID to full scan ID if needed
+        scan_details = None
+        full_scan_id = scan_id
+        if scan_id.startswith("S") and restaurant_id:
+            print(f"🔍 Resolving short scan ID {scan_id} to full scan ID")
+            self.logger.info(f"Resolving short scan ID {scan_id} to full scan ID")
+            scan_details = self.get_scan_by_short_id(scan_id, restaurant_id)
+            if scan_details:
+                full_scan_id = scan_details.get("ID")
+                print(f"🔍 Resolved {scan_id} to {full_scan_id}")
+                self.logger.info(f"Resolved {scan_id} to {full_scan_id}")
+                if not full_scan_id:
+                    return None, {
+                        "action": action,
+                        "error": f"Could not resolve full scan ID for {scan_id}",
+                    }
+            else:
+                # If scan not found in Skoopin and action is delete, treat as successful
+                if action_type == "delete":
+                    print(
+                        f"🔍 Scan {scan_id} not found in Skoopin, treating delete as successful"
+                    )
+                    self.logger.info(
+                        f"Scan {scan_id} not found in Skoopin, treating delete as successful"
+                    )
+                    return {
+                        "success": True,
+                        "scan_id": scan_id,
+                        "action_type": "delete",
+                        "message": "Scan not found in Skoopin (already deleted or doesn't exist)",
+                    }, None
+                else:
+                    return None, {
+                        "action": action,
+                        "error": f"Could not find scan with short ID {scan_id}",
+                    }
+        else:
+            print(f"🔍 Using scan ID as-is: {scan_id}")
+            self.logger.info(f"Using scan ID as-is: {scan_id}")
+
+        # Check scan status before applying actions (like reference script)
+        if scan_details is not None and scan_details.get("Status") != 1:
+            error_msg = f"Scan {scan_id} has status {scan_details.get('Status')}, cannot apply {action_type}"
+            print(f"🔍 {error_msg}")
+            self.logger.warning(error_msg)
+            return None, {"action": action, "error": error_msg}
+
+        # Apply the specific action using full scan ID
+        print(f"🔍 Applying {action_type} to scan {full_scan_id}")
+        self.logger.info(f"Applying {action_type} to scan {full_scan_id}")
+
+        if action_type == "delete":
+            result = self.delete_scan(full_scan_id)
+        elif action_type == "pan_change" or action_type == "updatePan":
+            print(
+                f"🔍 Calling update_scan_pan with scan_id={full_scan_id}, pan_id={new_value}"
+            )
+            result = self.update_scan_pan(full_scan_id, new_value)
+        elif action_type == "menu_item_change":
+            result = self.update_scan_menu_item(full_scan_id, new_value)
+        elif action_type == "venue_change":
+            result = self.update_scan_venue(full_scan_id, new_value)
+        elif action_type == "meal_period_change":
+            result = self.update_scan_meal_period(full_scan_id, new_value)
+        else:
+            print(f"🔍 Unknown action type: {action_type}")
+            result = {
+                "success": False,
+                "scan_id": full_scan_id,
+                "error": f"Unknown action type: {action_type}",
+            }
+
+        print(f"🔍 Action result: {result}")
+        self.logger.info(f"Action result: {result}")
+        return result, (None if result["success"] else result)
+
     def apply_audit_actions(
         self, actions: List[Dict[str, Any]], restaurant_id: int = None
     ) -> Dict[str, Any]:
@@ -630,120 +795,35 @@ class SkoopinService:
             "action_results": [],
         }
 
+        # Actions on different scans are independent HTTP calls, so run them
+        # concurrently; actions on the same scan stay sequential and in order
+        by_scan: Dict[str, List[int]] = {}
         for i, action in enumerate(actions):
-            scan_id = action.get("scan_id")
-            action_type = action.get("action_type")
-            new_value = action.get("new_value")
+            by_scan.setdefault(str(action.get("scan_id")), []).append(i)
+        outcomes: List[Any] = [None] * len(actions)
 
-            print(
-                f"🔍 Processing action {i+1}: {action_type} for scan {scan_id} with value {new_value}"
-            )
-            self.logger.info(
-                f"Processing action {i+1}: {action_type} for scan {scan_id} with value {new_value}"
-            )
-
-            if not scan_id or not action_type:
-                results["errors"].append(
-                    {"action": action, "error": "Missing scan_id or action_type"}
-                )
-                results["failed_actions"] += 1
-                continue
-
-            # Resolve short scan ID to full scan ID if needed
-            scan_details = None
-            full_scan_id = scan_id
-            if scan_id.startswith("S") and restaurant_id:
-                print(f"🔍 Resolving short scan ID {scan_id} to full scan ID")
-                self.logger.info(f"Resolving short scan ID {scan_id} to full scan ID")
-                scan_details = self.get_scan_by_short_id(scan_id, restaurant_id)
-                if scan_details:
-                    full_scan_id = scan_details.get("ID")
-                    print(f"🔍 Resolved {scan_id} to {full_scan_id}")
-                    self.logger.info(f"Resolved {scan_id} to {full_scan_id}")
-                    if not full_scan_id:
-                        results["errors"].append(
-                            {
-                                "action": action,
-                                "error": f"Could not resolve full scan ID for {scan_id}",
-                            }
-                        )
-                        results["failed_actions"] += 1
-                        continue
-                else:
-                    # If scan not found in Skoopin and action is delete, treat as successful
-                    if action_type == "delete":
-                        print(
-                            f"🔍 Scan {scan_id} not found in Skoopin, treating delete as successful"
-                        )
-                        self.logger.info(
-                            f"Scan {scan_id} not found in Skoopin, treating delete as successful"
-                        )
-                        results["action_results"].append(
-                            {
-                                "success": True,
-                                "scan_id": scan_id,
-                                "action_type": "delete",
-                                "message": "Scan not found in Skoopin (already deleted or doesn't exist)",
-                            }
-                        )
-                        results["applied_actions"] += 1
-                        continue
-                    else:
-                        results["errors"].append(
-                            {
-                                "action": action,
-                                "error": f"Could not find scan with short ID {scan_id}",
-                            }
-                        )
-                        results["failed_actions"] += 1
-                        continue
-            else:
-                print(f"🔍 Using scan ID as-is: {scan_id}")
-                self.logger.info(f"Using scan ID as-is: {scan_id}")
-
-            # Check scan status before applying actions (like reference script)
-            if scan_details is not None and scan_details.get("Status") != 1:
-                error_msg = f"Scan {scan_id} has status {scan_details.get('Status')}, cannot apply {action_type}"
-                print(f"🔍 {error_msg}")
-                self.logger.warning(error_msg)
-                results["errors"].append({"action": action, "error": error_msg})
-                results["failed_actions"] += 1
-                continue
-
-            # Apply the specific action using full scan ID
-            print(f"🔍 Applying {action_type} to scan {full_scan_id}")
-            self.logger.info(f"Applying {action_type} to scan {full_scan_id}")
+        # Fetch the token once up front rather than from every action thread
+        try:
+            self.get_access_token()
+        except Exception:
+            pass  # already logged; each action reports its own failure
 
-            if action_type == "delete":
-                result = self.delete_scan(full_scan_id)
-            elif action_type == "pan_change" or action_type == "updatePan":
-                print(
-                    f"🔍 Calling update_scan_pan with scan_id={full_scan_id}, pan_id={new_value}"
-                )
-                result = self.update_scan_pan(full_scan_id, new_value)
-            elif action_type == "menu_item_change":
-                result = self.update_scan_menu_item(full_scan_id, new_value)
-            elif action_type == "venue_change":
-                result = self.update_scan_venue(full_scan_id, new_value)
-            elif action_type == "meal_period_change":
-                result = self.update_scan_meal_period(full_scan_id, new_value)
-            else:
-                print(f"🔍 Unknown action type: {action_type}")
-                result = {
-                    "success": False,
-                    "scan_id": full_scan_id,
-                    "error": f"Unknown action type: {action_type}",
-                }
+        def _apply_group(indices: List[int]) -> None:
+            for i in indices:
+                outcomes[i] = self._apply_audit_action(i, actions[i], restaurant_id)
 
-            print(f"🔍 Action result: {result}")
-            self.logger.info(f"Action result: {result}")
-            results["action_results"].append(result)
+        list(self._action_executor.map(_apply_group, by_scan.values()))
 
-            if result["success"]:
+        # Merge in the original action order
+        for action_result, error in outcomes:
+            if action_result is not None:
+                results["action_results"].append(action_result)
+            if action_result is not None and action_result["success"]:
                 results["applied_actions"] += 1
             else:
                 results["failed_actions"] += 1
-                results["errors"].append(result)
+            if error is not None:
+                results["errors"].append(error)
 
         # Overall success if at least one action was applied
         results["success"] = results["applied_actions"] > 0
@@ -1,19 +1,26 @@
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 _config: Optional[Dict[str, Any]] = None
 
 
+@lru_cache(maxsize=1)
+def _read_config_file(path: str, mtime: float) -> Dict[str, Any]:
+    # mtime is part of the cache key so edits to config.yaml are picked up
+    print(f"✅ configuration loaded from: {path}")
+    with open(path, "r") as f:
+        data: Dict[str, Any] = yaml.safe_load(f)
+        return data
+
+
 def load_config() -> Dict[str, Any]:
     repo_root = Path(__file__).resolve().parents[2]
     config_file = repo_root / "config.yaml"
 
     if config_file.exists():
-        print(f"✅ configuration loaded from: {config_file}")
-        with open(config_file, "r") as f:
-            data: Dict[str, Any] = yaml.safe_load(f)
-            return data
+        return _read_config_file(str(config_file), config_file.stat().st_mtime)
     else:
         raise FileNotFoundError(f"Config file not found at: {config_file}")
 
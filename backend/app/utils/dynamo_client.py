@@ -1,10 +1,16 @@
 import boto3
+from botocore.config import Config
 from typing import Any, Dict, Optional
 
 from app.utils.config import get_config
+from app.utils.ttl_cache import TTLCache
 
 dynamodb: Optional[Any] = None
 
+# Table status costs a DescribeTable round trip; /status is polled, so the
+# answer is reused briefly
+_table_status: TTLCache[str] = TTLCache(maxsize=8, ttl=30)
+
 
 def init_dynamodb() -> None:
     global dynamodb
@@ -16,6 +22,14 @@ def init_dynamodb() -> None:
         region_name=aws_config["region"],
         aws_access_key_id=aws_config["access_key_id"],
         aws_secret_access_key=aws_config["secret_access_key"],
+        # Client-side rate limiting plus jittered backoff on throttling; the
+        # pool is sized for the request, background and executor threads that
+        # share this resource (botocore defaults to 10 connections)
+        config=Config(
+            retries={"mode": "adaptive", "max_attempts": 8},
+            max_pool_connections=64,
+            tcp_keepalive=True,
+        ),
     )
 
 
@@ -44,9 +58,18 @@ def describe_table(table_name: str) -> Dict[str, Any] | str:
         return f"Error describing table: {str(e)}"
 
 
+def get_table_status(table_name: str) -> str:
+    """Return a table's status (e.g. ACTIVE), cached for 30 seconds."""
+    status = _table_status.get(table_name)
+    if status is None:
+        description = get_dynamodb().meta.client.describe_table(TableName=table_name)
+        status = description["Table"]["TableStatus"]
+        _table_status.set(table_name, status)
+    return status
+
+
 def test_connection(table_name: str) -> str:
     try:
-        table = get_dynamodb().Table(table_name)
-        return f"Table '{table_name}' is {table.table_status}"
+        return f"Table '{table_name}' is {get_table_status(table_name)}"
     except Exception as e:
         return f"Connection failed: {str(e)}"
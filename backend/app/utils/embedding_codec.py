@@ -0,0 +1,49 @@
+import io
+from typing import Any, Dict, Optional
+
+import numpy as np
+import orjson
+
+# Keys are stored as JSON so int and str ids round-trip with their type
+_KEYS_ENTRY = "__keys__"
+
+
+def sidecar_key(pickle_key: str) -> str:
+    """S3 key of the array-only copy stored next to a ``.pkl`` embedding file."""
+    base = pickle_key[:-4] if pickle_key.endswith(".pkl") else pickle_key
+    return f"{base}.npz"
+
+
+def dump_embeddings(embeddings: Any) -> Optional[bytes]:
+    """
+    Encode a flat ``{id: ndarray}`` dict without pickle
+
+    Args:
+        embeddings: Embedding dict to encode
+
+    Returns:
+        ``.npz`` bytes, or None if the object is not a flat dict of numeric
+        arrays with str/int keys (callers keep using pickle for those)
+    """
+    if not isinstance(embeddings, dict):
+        return None
+    keys = list(embeddings)
+    arrays = {}
+    for i, key in enumerate(keys):
+        value = embeddings[key]
+        if not isinstance(key, (str, int)) or isinstance(key, bool):
+            return None
+        if not isinstance(value, np.ndarray) or value.dtype.hasobject:
+            return None
+        arrays[f"a{i}"] = value
+    arrays[_KEYS_ENTRY] = np.frombuffer(orjson.dumps(keys), dtype=np.uint8)
+    buf = io.BytesIO()
+    np.savez(buf, **arrays)
+    return buf.getvalue()
+
+
+def load_embeddings(data: bytes) -> Dict[Any, np.ndarray]:
+    """Decode bytes written by ``dump_embeddings``; never unpickles."""
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        keys = orjson.loads(npz[_KEYS_ENTRY].tobytes())
+        return {key: npz[f"a{i}"] for i, key in enumerate(keys)}
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _orjson_default(obj: Any) -> Any:
+    # DynamoDB returns numbers as Decimal; orjson has no native support for them
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` exactly as FastJSONResponse renders it."""
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes Decimal and set values."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
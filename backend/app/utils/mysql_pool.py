@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of reusable DB-API connections.
+
+    Idle connections are handed out most-recently-used first and pinged
+    before reuse; connections older than ``lifetime`` seconds are closed
+    instead of reused so they never outlive the server's idle timeout.
+    At most ``max_idle`` connections are kept between calls.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_idle: int = 8,
+        lifetime: float = 600.0,
+    ) -> None:
+        self.factory = factory
+        self.max_idle = max_idle
+        self.lifetime = lifetime
+        self._idle: List[Tuple[Any, float]] = []
+        self._born: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _discard(self, conn: Any) -> None:
+        with self._lock:
+            self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self) -> Any:
+        """
+        Return a live connection, reusing an idle one when possible
+
+        Returns:
+            A connection that must be handed back with ``release``
+        """
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                break
+            conn, born = entry
+            if time.monotonic() - born >= self.lifetime:
+                self._discard(conn)
+                continue
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Exception:
+                self._discard(conn)
+        conn = self.factory()
+        with self._lock:
+            self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def release(self, conn: Any, broken: bool = False) -> None:
+        """Return ``conn`` to the pool, or close it if broken, stale or surplus."""
+        with self._lock:
+            born = self._born.get(id(conn))
+            keep = (
+                not broken
+                and not self._closed
+                and born is not None
+                and time.monotonic() - born < self.lifetime
+                and len(self._idle) < self.max_idle
+            )
+            if keep:
+                self._idle.append((conn, born))
+                return
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            self.release(conn, broken=True)
+            raise
+        self.release(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+        if idle:
+            logger.info(f"Closed {len(idle)} pooled MySQL connections")
@@ -0,0 +1,36 @@
+import redis
+from typing import Optional
+
+from app.utils.config import get_config
+
+redis_pool: Optional[redis.ConnectionPool] = None
+
+
+def init_redis_pool() -> redis.ConnectionPool:
+    global redis_pool
+    if redis_pool is None:
+        redis_config = get_config().get("redis", {})
+        redis_pool = redis.ConnectionPool(
+            host=redis_config.get("host", "127.0.0.1"),
+            port=int(redis_config.get("port", 6379)),
+            db=int(redis_config.get("db", 0)),
+            max_connections=int(redis_config.get("max_connections", 32)),
+            # Fail fast instead of hanging a request when Redis is unreachable
+            socket_connect_timeout=float(redis_config.get("socket_connect_timeout", 3)),
+            socket_timeout=float(redis_config.get("socket_timeout", 5)),
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+    return redis_pool
+
+
+def get_redis_pool() -> redis.ConnectionPool:
+    # Created lazily so code running outside the API lifespan can share it too
+    return init_redis_pool()
+
+
+def close_redis_pool() -> None:
+    global redis_pool
+    if redis_pool is not None:
+        redis_pool.disconnect()
+        redis_pool = None
@@ -14,6 +14,9 @@ export AWS_ENV=${AWS_ENV:-"prd"}
 export DYNAMODB_AUDIT_SESSION_TABLE=${DYNAMODB_AUDIT_SESSION_TABLE:-"AuditSession"}
 export DYNAMODB_SCAN_AUDIT_TABLE=${DYNAMODB_SCAN_AUDIT_TABLE:-"ScanAuditTable"}
 export DYNAMODB_USERS_TABLE=${DYNAMODB_USERS_TABLE:-"Users"}
+export DYNAMODB_AUDIT_SESSION_RESTAURANT_INDEX=${DYNAMODB_AUDIT_SESSION_RESTAURANT_INDEX:-""}
+export DYNAMODB_SCAN_AUDIT_DATE_INDEX=${DYNAMODB_SCAN_AUDIT_DATE_INDEX:-""}
+export DYNAMODB_SCAN_AUDIT_DATE_KEY=${DYNAMODB_SCAN_AUDIT_DATE_KEY:-"date"}
 
 export SKOOPIN_SERVER_ADDRESS=${SKOOPIN_SERVER_ADDRESS:-"https://mercato.skoopin.net/api/v1"}
 export SKOOPIN_CLIENT_ID=${SKOOPIN_CLIENT_ID:-"6q7je53tsgpvcm154gjd3bh04o"}
@@ -1,4 +1,6 @@
+import asyncio
 import sys
+import threading
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -6,12 +8,14 @@ backend_dir = Path(__file__).resolve().parent
 if str(backend_dir) not in sys.path:
     sys.path.insert(0, str(backend_dir))
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
+from app.api.routes import start_ai_run_subscriber
 from app.audit_service import AuditService
 from app.aws_service import AWSService
 from app.database_service import DatabaseService
@@ -20,12 +24,23 @@ from app.scheduler import start_scheduler
 from app.skoopin_service import SkoopinService
 from app.utils.config import *
 from app.utils.dynamo_client import *
+from app.utils.json_response import FastJSONResponse
+from app.utils.redis_client import close_redis_pool, init_redis_pool
+
+
+def _run_bg_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🔗 Initializing DynamoDB connection...")
     init_dynamodb()
+    print("🔗 Initializing Redis connection pool...")
+    app.state.redis_pool = init_redis_pool()
+    # Pan AI runs finish in the RQ worker; pick up their results here
+    app.state.ai_run_subscriber = start_ai_run_subscriber(app.state.redis_pool)
     print("🔗 Initializing Skoopin service...")
     app.state.skoopin_service = SkoopinService()
     app.state.dynamo_service = DynamoDBService()
@@ -36,13 +51,44 @@ async def lifespan(app: FastAPI):
     app.state.audit_service = AuditService(
         skoopin_service=app.state.skoopin_service,
         dynamo_service=app.state.dynamo_service,
+        database_service=app.state.database_service,
+    )
+    # Shared, bounded pool for fire-and-forget work triggered from the API
+    app.state.bg_executor = ThreadPoolExecutor(
+        max_workers=8, thread_name_prefix="metron-bg"
+    )
+    # Presigning is short and bursty (one call per pan image); keep it off the
+    # background pool so a long AI run cannot starve /pans
+    app.state.presign_executor = ThreadPoolExecutor(
+        max_workers=16, thread_name_prefix="metron-presign"
+    )
+    # Long-lived event loop for background coroutines (population / AI runs)
+    app.state.bg_loop = asyncio.new_event_loop()
+    bg_loop_thread = threading.Thread(
+        target=_run_bg_loop,
+        args=(app.state.bg_loop,),
+        name="metron-bg-loop",
+        daemon=True,
     )
+    bg_loop_thread.start()
+    # Bring the DB tunnel up off the startup path so the first /pans or
+    # /db/ping request does not pay for the SSH handshake
+    app.state.bg_executor.submit(app.state.database_service.start_tunnel)
     print("🕒 Starting scheduler (16:00 & 20:00 PT / 4:00 PM & 8:00 PM)…")
     start_scheduler()
     yield
+    app.state.bg_executor.shutdown(wait=False)
+    app.state.presign_executor.shutdown(wait=False)
+    app.state.skoopin_service.close()
+    app.state.aws_service.close()
+    app.state.bg_loop.call_soon_threadsafe(app.state.bg_loop.stop)
+    bg_loop_thread.join(timeout=5)
+    app.state.ai_run_subscriber.set()
+    close_redis_pool()
 
 
-app = FastAPI(lifespan=lifespan)
+# Routes on the app itself (e.g. the health check) also render via orjson
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Allow frontend (React) access
 app.add_middleware(
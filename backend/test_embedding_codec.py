@@ -0,0 +1,62 @@
+"""Tests for the pickle-free embedding encoding."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("orjson")
+
+from app.utils.embedding_codec import (  # noqa: E402
+    dump_embeddings,
+    load_embeddings,
+    sidecar_key,
+)
+
+
+def test_round_trip_keeps_int_and_str_keys():
+    embeddings = {
+        101: np.arange(4, dtype=np.float32),
+        "202": np.ones((2, 3), dtype=np.float64),
+        7: np.array([], dtype=np.int64),
+    }
+
+    loaded = load_embeddings(dump_embeddings(embeddings))
+
+    assert list(loaded) == [101, "202", 7]
+    for key, value in embeddings.items():
+        assert loaded[key].dtype == value.dtype
+        assert loaded[key].shape == value.shape
+        np.testing.assert_array_equal(loaded[key], value)
+
+
+def test_round_trip_empty_dict():
+    assert load_embeddings(dump_embeddings({})) == {}
+
+
+@pytest.mark.parametrize(
+    "embeddings",
+    [
+        [np.zeros(2)],
+        None,
+        {1: [0.1, 0.2]},
+        {1: np.array([object()], dtype=object)},
+        {True: np.zeros(2)},
+        {(1, 2): np.zeros(2)},
+        {1.5: np.zeros(2)},
+    ],
+    ids=[
+        "not-a-dict",
+        "none",
+        "list-value",
+        "object-array",
+        "bool-key",
+        "tuple-key",
+        "float-key",
+    ],
+)
+def test_unencodable_embeddings_return_none(embeddings):
+    assert dump_embeddings(embeddings) is None
+
+
+def test_sidecar_key():
+    assert sidecar_key("a/b/embeddings.pkl") == "a/b/embeddings.npz"
+    assert sidecar_key("a/b/embeddings") == "a/b/embeddings.npz"
@@ -0,0 +1,134 @@
+"""Tests for the pooled MySQL connection helper."""
+
+import pytest
+
+from app.utils import mysql_pool
+from app.utils.mysql_pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, number: int):
+        self.number = number
+        self.closed = False
+        self.alive = True
+
+    def ping(self, reconnect: bool = False) -> None:
+        if not self.alive:
+            raise ConnectionError("server has gone away")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; advance it by assigning to ``clock.now``."""
+
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(mysql_pool.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def made():
+    return []
+
+
+@pytest.fixture
+def factory(made):
+    def _factory() -> FakeConnection:
+        conn = FakeConnection(len(made))
+        made.append(conn)
+        return conn
+
+    return _factory
+
+
+def test_released_connection_is_reused(clock, factory, made):
+    pool = ConnectionPool(factory, lifetime=600)
+    first = pool.acquire()
+    pool.release(first)
+
+    assert pool.acquire() is first
+    assert len(made) == 1
+
+
+def test_idle_connection_is_recycled_after_lifetime(clock, factory, made):
+    pool = ConnectionPool(factory, lifetime=600)
+    first = pool.acquire()
+    pool.release(first)
+
+    clock.now += 600
+    second = pool.acquire()
+
+    assert second is not first
+    assert first.closed
+    assert len(made) == 2
+
+
+def test_connection_past_lifetime_is_closed_on_release(clock, factory):
+    pool = ConnectionPool(factory, lifetime=600)
+    conn = pool.acquire()
+
+    clock.now += 601
+    pool.release(conn)
+
+    assert conn.closed
+    assert pool.acquire() is not conn
+
+
+def test_error_inside_connection_discards_it(clock, factory, made):
+    pool = ConnectionPool(factory)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            raise RuntimeError("query failed")
+
+    assert conn.closed
+    assert pool.acquire() is not conn
+    assert len(made) == 2
+
+
+def test_clean_exit_returns_connection_to_pool(clock, factory):
+    pool = ConnectionPool(factory)
+    with pool.connection() as conn:
+        pass
+
+    assert not conn.closed
+    assert pool.acquire() is conn
+
+
+def test_connection_failing_ping_is_replaced(clock, factory):
+    pool = ConnectionPool(factory)
+    dead = pool.acquire()
+    pool.release(dead)
+    dead.alive = False
+
+    conn = pool.acquire()
+
+    assert conn is not dead
+    assert dead.closed
+
+
+def test_surplus_connections_beyond_max_idle_are_closed(clock, factory):
+    pool = ConnectionPool(factory, max_idle=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert not first.closed
+    assert second.closed
+
+
+def test_close_closes_idle_and_later_releases(clock, factory):
+    pool = ConnectionPool(factory)
+    idle, in_use = pool.acquire(), pool.acquire()
+    pool.release(idle)
+
+    pool.close()
+    pool.release(in_use)
+
+    assert idle.closed
+    assert in_use.closed
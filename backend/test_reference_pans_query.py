@@ -0,0 +1,102 @@
+"""Tests for the latest-scan-per-pan query and its parameter binding."""
+
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip("pymysql")
+pytest.importorskip("sshtunnel")
+pytest.importorskip("orjson")
+
+from app.database_service import (  # noqa: E402
+    DatabaseService,
+    _REFERENCE_PANS_TTL,
+    _reference_pans_query,
+)
+from app.utils.ttl_cache import TTLCache  # noqa: E402
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.executed.append((query, params))
+
+    def __iter__(self):
+        return iter([dict(row) for row in self.rows])
+
+
+class FakePool:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @contextmanager
+    def connection(self):
+        conn = type("Conn", (), {"cursor": lambda _self, _cls: self.cursor})()
+        yield conn
+
+
+def _service(window, rows=()):
+    # Only the attributes get_reference_pans_for_restaurant touches; no tunnel
+    service = DatabaseService.__new__(DatabaseService)
+    service._pan_cache = TTLCache(128, _REFERENCE_PANS_TTL)
+    service._window_functions = window
+    service._pool = FakePool(FakeCursor(rows))
+    service.start_tunnel = lambda: True
+    return service
+
+
+@pytest.mark.parametrize("window", [True, False], ids=["window", "mysql57"])
+@pytest.mark.parametrize("types", [None, [6], [1, 6]])
+@pytest.mark.parametrize("pan_ids", [None, [11], [11, 12, 13]])
+@pytest.mark.parametrize("date", [None, "2024-05-01"])
+def test_placeholders_match_bound_params(window, types, pan_ids, date):
+    service = _service(window)
+
+    service.get_reference_pans_for_restaurant(
+        157, date=date, types=types, pan_ids=pan_ids, days_back=2
+    )
+
+    [(query, params)] = service._pool.cursor.executed
+    assert query.count("%s") == len(params)
+    assert params[0] == 157
+    assert params[-1] == 5000
+
+
+def test_mysql57_query_repeats_the_filter_for_its_subquery():
+    window_sql = _reference_pans_query(2, 3, True, True)
+    legacy_sql = _reference_pans_query(2, 3, True, False)
+
+    # restaurant + 2 types + 3 pans + 2 bounds, then the limit
+    assert window_sql.count("%s") == 8 + 1
+    assert legacy_sql.count("%s") == 2 * 8 + 1
+    assert "ROW_NUMBER()" in window_sql
+    assert "ROW_NUMBER()" not in legacy_sql
+
+
+def test_empty_pan_id_list_skips_the_query():
+    service = _service(True)
+
+    assert service.get_reference_pans_for_restaurant(157, pan_ids=[]) == []
+    assert service._pool.cursor.executed == []
+
+
+def test_cached_rows_are_copies():
+    row = {"PanID": 11, "PansData": '{"a": 1}', "Weight": None}
+    service = _service(True, rows=[row])
+
+    first = service.get_reference_pans_for_restaurant(157, types=[6])
+    first[0]["Weight"] = 99.0
+    second = service.get_reference_pans_for_restaurant(157, types=[6])
+
+    assert len(service._pool.cursor.executed) == 1
+    assert second[0]["Weight"] == 0.0
+    assert second[0]["Data"] == {"a": 1}
@@ -0,0 +1,156 @@
+"""Parity tests: the shared scan predicates against the original inline rules."""
+
+import itertools
+from typing import Any
+
+import pytest
+
+from app.api.scan_predicates import (
+    has_menu_id,
+    has_pan_id,
+    is_bad_scan,
+    is_empty_scan,
+    is_non_food,
+)
+
+
+# The rules as they were written inline in the /restaurants/with-scans route,
+# kept verbatim as the reference behaviour
+def _to_float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        return value.strip().lower() in {"true", "1", "yes", "y"}
+    return False
+
+
+def _has_pan_id(scan: dict) -> bool:
+    pan_id = scan.get("panId") or scan.get("PanID") or scan.get("pan_id")
+    if isinstance(pan_id, str) and pan_id.strip().lower() in {
+        "unrecognized",
+        "unknown",
+        "none",
+        "",
+    }:
+        pan_id = None
+    return pan_id is not None
+
+
+def _has_menu_id(scan: dict) -> bool:
+    menu_id = (
+        scan.get("menuItemId")
+        or scan.get("MenuItemID")
+        or scan.get("reportedMenuItemId")
+    )
+    return menu_id is not None
+
+
+def _is_empty_scan(scan: dict) -> bool:
+    if (
+        _to_bool(scan.get("isEmpty"))
+        or _to_bool(scan.get("empty"))
+        or _to_bool(scan.get("emptyScan"))
+        or _to_bool(scan.get("IsEmptyScan"))
+    ):
+        return True
+    reason = (
+        (scan.get("panAuditReason") or scan.get("reason") or scan.get("tags") or "")
+        .__str__()
+        .lower()
+    )
+    return "empty" in reason
+
+
+def _is_non_food(scan: dict) -> bool:
+    if (
+        _to_bool(scan.get("nonFood"))
+        or _to_bool(scan.get("isNonFood"))
+        or _to_bool(scan.get("non_food"))
+    ):
+        return True
+    label = (
+        (
+            scan.get("classification")
+            or scan.get("label")
+            or scan.get("panAuditReason")
+            or ""
+        )
+        .__str__()
+        .lower()
+    )
+    return ("non food" in label) or ("non-food" in label) or ("nonfood" in label)
+
+
+def _is_bad_scan(scan: dict) -> bool:
+    weight_under = _to_float(scan.get("weight"), 0.0) < 8.0
+    no_ids = (not _has_pan_id(scan)) and (not _has_menu_id(scan))
+    if weight_under and no_ids:
+        return True
+    if _is_empty_scan(scan):
+        return True
+    if _is_non_food(scan):
+        return True
+    return False
+
+
+_MISSING = object()
+
+# Candidate values per field; _MISSING leaves the field out of the scan
+_FIELD_VALUES = {
+    "weight": (_MISSING, 3, "7.9", "12", "abc"),
+    "panId": (_MISSING, None, "", " Unknown ", "null", "P1", 0),
+    "PanID": (_MISSING, "P2"),
+    "menuItemId": (_MISSING, "", 0, "M1"),
+    "isEmpty": (_MISSING, True, " Y ", 0, "false"),
+    "nonFood": (_MISSING, 1, "no"),
+    "panAuditReason": (_MISSING, None, "Empty pan", "Non-Food item", "ok"),
+    "classification": (_MISSING, "NonFood", ""),
+    "reason": (_MISSING, "EMPTY"),
+}
+
+
+def _all_scans():
+    fields = list(_FIELD_VALUES)
+    return [
+        {f: v for f, v in zip(fields, values) if v is not _MISSING}
+        for values in itertools.product(*_FIELD_VALUES.values())
+    ]
+
+
+@pytest.fixture(scope="module")
+def scans():
+    return _all_scans()
+
+
+@pytest.mark.parametrize(
+    "predicate, reference",
+    [
+        (has_pan_id, _has_pan_id),
+        (has_menu_id, _has_menu_id),
+        (is_empty_scan, _is_empty_scan),
+        (is_non_food, _is_non_food),
+        (is_bad_scan, _is_bad_scan),
+    ],
+    ids=lambda f: getattr(f, "__name__", ""),
+)
+def test_predicate_matches_inline_rule(scans, predicate, reference):
+    mismatches = [scan for scan in scans if predicate(scan) is not reference(scan)]
+    assert mismatches[:5] == []
+
+
+def test_alternate_spellings_are_honoured():
+    assert is_empty_scan({"IsEmptyScan": "1"})
+    assert is_empty_scan({"tags": "EMPTY tray"})
+    assert is_non_food({"label": "non food"})
+    assert is_non_food({"non_food": True})
+    assert has_pan_id({"pan_id": "P9"})
+    assert not is_bad_scan({"weight": 3, "MenuItemID": "M2"})
@@ -0,0 +1,80 @@
+"""Tests for the in-process TTL cache."""
+
+import pytest
+
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; advance it by assigning to ``clock.now``."""
+
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: Clock.now)
+    return Clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+
+    clock.now += 50
+    assert cache.get("short", default="miss") == "miss"
+    assert cache.get("long") == 2
+
+
+def test_min_ttl_treats_nearly_expired_entries_as_misses(clock):
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("token", "abc")
+
+    clock.now += 50
+    # 10s left: fine for a caller that needs 5s, a miss for one that needs 30s
+    assert cache.get("token", min_ttl=5) == "abc"
+    assert cache.get("token", min_ttl=30) is None
+    # A min_ttl miss keeps the entry for callers with looser needs
+    assert cache.get("token") == "abc"
+
+
+def test_lru_entry_is_evicted_at_maxsize(clock):
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_pop_evict_and_clear(clock):
+    cache = TTLCache(maxsize=8, ttl=60)
+    for key in ("1#2024-01-01", "2#2024-01-01", "1#2024-01-02"):
+        cache.set(key, key)
+
+    assert cache.pop("1#2024-01-02") == "1#2024-01-02"
+    assert cache.pop("1#2024-01-02", default="gone") == "gone"
+    assert cache.evict(lambda key: key.endswith("#2024-01-01")) == 2
+    assert len(cache) == 0
+
+    cache.set("x", 1)
+    cache.clear()
+    assert cache.get("x") is None